@@ -12,9 +12,15 @@ LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 # Directorio por defecto para imágenes
 DEFAULT_OUTPUT_DIR = "imagenes_obras"
 
+# Formato por defecto de las imágenes guardadas ('jpg' guarda los bytes originales)
+DEFAULT_IMAGE_FORMAT = "jpg"
+
 # Delay por defecto entre peticiones (segundos)
 DEFAULT_DELAY = 1.0
 
+# Obras procesándose en simultáneo por defecto (tareas en modo asíncrono, hilos en modo síncrono)
+DEFAULT_CONCURRENCY = 1
+
 # Timeout por defecto para peticiones HTTP (segundos)
 DEFAULT_TIMEOUT = 30
 
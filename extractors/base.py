@@ -3,15 +3,29 @@ Clase base abstracta para extractores de obras de arte.
 """
 
 from abc import ABC, abstractmethod
+import asyncio
 import logging
-from typing import Dict, Optional, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
 from dataclasses import dataclass
 import os
+import sys
+
+from utils.file_utils import get_save_path
+from utils.image_utils import Image, IMAGE_FORMATS, needs_recompression, recompress_image
+from utils.network_utils import (aiohttp, RateLimiter, create_session, download_image,
+                                 download_image_async, fetch_html_async)
+from utils.registry_utils import ExtractionRegistry, ObraStatus
 
 logger = logging.getLogger(__name__)
 
+# Sin __dict__ por instancia: menos memoria y acceso a atributos más rápido.
+# slots=True solo existe desde Python 3.10.
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ObraInfo:
     """Información de una obra de arte."""
     titulo: str
@@ -21,7 +35,7 @@ class ObraInfo:
     obra_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ExtractionStats:
     """Estadísticas de una extracción."""
     obras_encontradas: int = 0
@@ -38,8 +52,19 @@ class BaseExtractor(ABC):
     los métodos abstractos.
     """
     
+    # User-Agent a enviar en las peticiones (None usa el de la librería HTTP)
+    USER_AGENT: Optional[str] = None
+    
+    # Método opcional parse_obra_info(obra_id, html) -> Optional[ObraInfo], que
+    # extrae la información de una obra a partir de su HTML ya descargado. Solo
+    # lo necesita el modo asíncrono, donde el HTML lo descarga el pipeline; los
+    # extractores que no lo definan se procesan en hilos con extract_obra_info()
+    parse_obra_info: Optional[Callable[[str, str], Optional[ObraInfo]]] = None
+    
     def __init__(self, output_dir: str = "imagenes_obras", delay: float = 1.0, 
-                 use_registry: bool = True, check_existing_files: bool = True):
+                 use_registry: bool = True, check_existing_files: bool = True,
+                 concurrency: int = 1, skip_not_found: bool = False,
+                 image_format: str = "jpg"):
         """
         Inicializa el extractor.
         
@@ -48,17 +73,47 @@ class BaseExtractor(ABC):
             delay: Segundos de espera entre peticiones
             use_registry: Si es True, usa el sistema de registro para evitar duplicados
             check_existing_files: Si es True, verifica si el archivo ya existe antes de descargar
+            concurrency: Número máximo de obras procesándose en simultáneo
+            skip_not_found: Si es True, omite sin pedirlas las obras que el registro
+                marca como no encontradas
+            image_format: Formato de las imágenes guardadas ('jpg' guarda los bytes
+                del servidor; 'webp' recomprime con Pillow)
+            
+        Raises:
+            ValueError: Si el formato no es válido o falta Pillow para recomprimir
         """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Formato de imagen no válido: {image_format}. "
+                             f"Formatos disponibles: {', '.join(IMAGE_FORMATS)}")
+        if needs_recompression(image_format) and Image is None:
+            raise ValueError(f"El formato {image_format} requiere Pillow (pip install Pillow)")
+        
         self.output_dir = output_dir
         self.delay = delay
+        self.concurrency = max(1, concurrency)
+        # Turnos de petición compartidos por todos los hilos/tareas
+        self._rate_limiter = RateLimiter(delay)
+        # Protege las estadísticas cuando varias obras se procesan en hilos
+        self._lock = threading.Lock()
+        # Nombres de archivo ya presentes en cada directorio de salida
+        self._listing_cache: Dict[str, Set[str]] = {}
+        # Rutas que alguna obra está descargando en este momento (protegido por _lock)
+        self._in_flight: Set[str] = set()
         self.stats = ExtractionStats()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.use_registry = use_registry
         self.check_existing_files = check_existing_files
+        self.skip_not_found = skip_not_found
+        self.image_format = image_format
+        # Pool de procesos para recomprimir sin bloquear el event loop (modo asíncrono)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        # IDs que el registro marca como no encontrados (se carga al iniciar cada rango)
+        self._known_missing: Set[str] = set()
+        # Sesión HTTP propia del extractor: reutiliza conexiones entre obras
+        self.session = create_session(user_agent=self.USER_AGENT, pool_maxsize=max(32, self.concurrency))
         
         # Inicializar registro si está habilitado
         if self.use_registry:
-            from utils.registry_utils import ExtractionRegistry
             registry_file = os.path.join(output_dir, ".extraction_registry.json")
             self.registry = ExtractionRegistry(registry_file)
         else:
@@ -90,6 +145,11 @@ class BaseExtractor(ABC):
         """
         pass
     
+    @property
+    def supports_async(self) -> bool:
+        """True si el extractor puede ejecutarse con el pipeline asíncrono."""
+        return aiohttp is not None and self.parse_obra_info is not None
+    
     def download_obra(self, obra_info: ObraInfo) -> bool:
         """
         Descarga la imagen de una obra.
@@ -100,45 +160,172 @@ class BaseExtractor(ABC):
         Returns:
             True si la descarga fue exitosa, False en caso contrario
         """
-        if not obra_info.url_imagen:
-            self.logger.warning(f"No hay URL de imagen para {obra_info.titulo}")
+        save_path = self._prepare_download(obra_info)
+        if not save_path:
             return False
+        if self._skip_existing_file(obra_info, save_path):
+            return True
         
-        from utils.file_utils import get_save_path
-        from utils.network_utils import download_image
+        success = False
+        try:
+            # Descargar imagen
+            base_url = self.get_base_image_url()
+            download_path = self._download_path(save_path)
+            # get_save_path ya creó el directorio del artista
+            success = download_image(obra_info.url_imagen, base_url, download_path, session=self.session,
+                                     ensure_dir=False)
+            if success and download_path != save_path:
+                success = recompress_image(download_path, save_path, self.image_format)
+        finally:
+            self._release_save_path(save_path, success)
+        self._register_download(obra_info, save_path, success)
+        return success
+    
+    async def download_obra_async(self, session: "aiohttp.ClientSession", obra_info: ObraInfo) -> bool:
+        """
+        Versión asíncrona de download_obra.
+        
+        Args:
+            session: Sesión de aiohttp del pipeline
+            obra_info: Información de la obra a descargar
+            
+        Returns:
+            True si la descarga fue exitosa, False en caso contrario
+        """
+        save_path = self._prepare_download(obra_info)
+        if not save_path:
+            return False
+        if self._skip_existing_file(obra_info, save_path):
+            return True
         
-        # Construir ruta de guardado
-        save_path = get_save_path(
+        success = False
+        try:
+            # Descargar imagen
+            base_url = self.get_base_image_url()
+            download_path = self._download_path(save_path)
+            success = await download_image_async(session, obra_info.url_imagen, base_url, download_path,
+                                                 ensure_dir=False)
+            if success and download_path != save_path:
+                # Recomprimir es CPU puro: se hace en otro proceso para no frenar las descargas
+                loop = asyncio.get_running_loop()
+                success = await loop.run_in_executor(
+                    self._process_pool, recompress_image, download_path, save_path, self.image_format
+                )
+        finally:
+            self._release_save_path(save_path, success)
+        self._register_download(obra_info, save_path, success)
+        return success
+    
+    def _prepare_download(self, obra_info: ObraInfo) -> Optional[str]:
+        """
+        Construye la ruta de guardado de una obra.
+        
+        Returns:
+            Ruta donde guardar la imagen, o None si la obra no tiene imagen
+        """
+        if not obra_info.url_imagen:
+            self.logger.warning("No hay URL de imagen para %s", obra_info.titulo)
+            return None
+        
+        return get_save_path(
             base_dir=self.output_dir,
             subdir=obra_info.artista,
             filename=obra_info.titulo,
-            extension="jpg"
+            extension=self.image_format
         )
+    
+    def _download_path(self, save_path: str) -> str:
+        """
+        Ruta donde descargar la imagen original antes de guardarla.
         
-        # Verificar si el archivo ya existe
-        if self.check_existing_files and os.path.exists(save_path):
-            self.logger.debug(f"Archivo ya existe, omitiendo descarga: {save_path}")
-            # Registrar en el registro si está habilitado
-            if self.registry and obra_info.obra_id:
-                self.registry.register_obra(
-                    obra_info.obra_id,
-                    'descargado',
-                    titulo=obra_info.titulo,
-                    artista=obra_info.artista,
-                    file_path=save_path
-                )
-            return True
+        Returns:
+            save_path si la imagen se guarda tal cual; si no, una ruta temporal
+        """
+        if needs_recompression(self.image_format):
+            return save_path + '.orig'
+        return save_path
+    
+    def _skip_existing_file(self, obra_info: ObraInfo, save_path: str) -> bool:
+        """
+        Verifica si la imagen ya fue descargada antes y, si no, reserva su ruta.
         
-        # Descargar imagen
-        base_url = self.get_base_image_url()
-        success = download_image(obra_info.url_imagen, base_url, save_path)
+        Dos obras con el mismo artista y título van a la misma ruta: si otra
+        obra la está descargando en este momento se trata como si el archivo
+        ya existiera, igual que cuando las obras se procesaban de a una.
         
+        Returns:
+            True si el archivo ya existe (o se está descargando) y no hace falta
+            descargarlo; False si la ruta quedó reservada para esta obra y hay
+            que liberarla con _release_save_path
+        """
+        with self._lock:
+            in_flight = save_path in self._in_flight
+            if not in_flight and not (self.check_existing_files and self._file_exists(save_path)):
+                self._in_flight.add(save_path)
+                return False
+        
+        if in_flight:
+            self.logger.debug("Archivo en descarga por otra obra, omitiendo: %s", save_path)
+        else:
+            self.logger.debug("Archivo ya existe, omitiendo descarga: %s", save_path)
+        # Registrar en el registro si está habilitado
+        if self.registry and obra_info.obra_id:
+            self.registry.register_obra(
+                obra_info.obra_id,
+                ObraStatus.DOWNLOADED,
+                titulo=obra_info.titulo,
+                artista=obra_info.artista,
+                file_path=save_path
+            )
+        return True
+    
+    def _file_exists(self, path: str) -> bool:
+        """
+        Verifica si un archivo existe usando un listado cacheado de su directorio.
+        
+        Cada directorio se lista una sola vez con os.scandir; después la
+        verificación es una búsqueda en un set, sin llamadas al sistema.
+        
+        Args:
+            path: Ruta del archivo
+            
+        Returns:
+            True si el archivo existe
+        """
+        dirpath, filename = os.path.split(path)
+        listing = self._listing_cache.get(dirpath)
+        if listing is None:
+            listing = {entry.name for entry in os.scandir(dirpath)} if os.path.isdir(dirpath) else set()
+            self._listing_cache[dirpath] = listing
+        return filename in listing
+    
+    def _release_save_path(self, save_path: str, success: bool) -> None:
+        """
+        Libera la ruta reservada por _skip_existing_file al terminar la descarga.
+        
+        Args:
+            save_path: Ruta de la imagen
+            success: Si la imagen quedó guardada (se agrega al listado cacheado)
+        """
+        with self._lock:
+            if success:
+                self._mark_file_exists(save_path)
+            self._in_flight.discard(save_path)
+    
+    def _mark_file_exists(self, path: str) -> None:
+        """Agrega un archivo recién escrito al listado cacheado de su directorio."""
+        dirpath, filename = os.path.split(path)
+        if dirpath in self._listing_cache:
+            self._listing_cache[dirpath].add(filename)
+    
+    def _register_download(self, obra_info: ObraInfo, save_path: str, success: bool) -> None:
+        """Registra el resultado de la descarga de una obra."""
         # Registrar en el registro si está habilitado
         if self.registry and obra_info.obra_id:
             if success:
                 self.registry.register_obra(
                     obra_info.obra_id,
-                    'descargado',
+                    ObraStatus.DOWNLOADED,
                     titulo=obra_info.titulo,
                     artista=obra_info.artista,
                     file_path=save_path
@@ -146,13 +333,11 @@ class BaseExtractor(ABC):
             else:
                 self.registry.register_obra(
                     obra_info.obra_id,
-                    'fallido',
+                    ObraStatus.FAILED,
                     titulo=obra_info.titulo,
                     artista=obra_info.artista,
                     error="Error al descargar imagen"
                 )
-        
-        return success
     
     def get_base_image_url(self) -> Optional[str]:
         """
@@ -173,62 +358,189 @@ class BaseExtractor(ABC):
         Returns:
             True si el proceso fue exitoso, False en caso contrario
         """
-        # Verificar si ya fue procesada (si el registro está habilitado)
-        if self.registry and self.registry.is_processed(obra_id, check_file=self.check_existing_files):
-            status = self.registry.get_status(obra_id)
-            self.logger.debug(f"Obra {obra_id} ya procesada (estado: {status}), omitiendo")
-            # Actualizar estadísticas según el estado registrado
-            if status == 'descargado':
-                self.stats.obras_encontradas += 1
-                self.stats.obras_descargadas += 1
-            elif status == 'encontrado':
-                self.stats.obras_encontradas += 1
-            return status == 'descargado'
+        skipped = self._check_registry(obra_id)
+        if skipped is not None:
+            return skipped
+        return self._process_new_obra(obra_id)
+    
+    def _process_new_obra(self, obra_id: str) -> bool:
+        """
+        Extrae y descarga una obra que el registro no da por procesada.
         
+        Args:
+            obra_id: Identificador único de la obra
+            
+        Returns:
+            True si el proceso fue exitoso, False en caso contrario
+        """
+        self._rate_limiter.wait()
+        # El try no tiene costo en el camino sin errores (CPython 3.11+) y evita
+        # que un fallo de un extractor aborte el resto del rango
         try:
             # Extraer información
             obra_info = self.extract_obra_info(obra_id)
-            
-            if not obra_info:
-                # Registrar como no encontrada
-                if self.registry:
-                    self.registry.register_obra(obra_id, 'no_encontrado')
+            if not self._on_obra_found(obra_id, obra_info):
                 return False
             
-            self.stats.obras_encontradas += 1
-            self.logger.info(f"Obra encontrada [{obra_id}]: {obra_info.titulo} - {obra_info.artista or 'Sin artista'}")
+            # Descargar imagen
+            return self._on_download_result(self.download_obra(obra_info))
+        except Exception as e:
+            return self._on_error(obra_id, e)
+    
+    async def process_obra_async(self, session: "aiohttp.ClientSession", obra_id: str) -> bool:
+        """
+        Versión asíncrona de process_obra, usada por extract_range_async.
+        
+        Args:
+            session: Sesión de aiohttp del pipeline
+            obra_id: Identificador único de la obra
             
-            # Registrar como encontrada (antes de intentar descargar)
-            if self.registry:
-                self.registry.register_obra(
-                    obra_id,
-                    'encontrado',
-                    titulo=obra_info.titulo,
-                    artista=obra_info.artista
-                )
+        Returns:
+            True si el proceso fue exitoso, False en caso contrario
+        """
+        skipped = self._check_registry(obra_id)
+        if skipped is not None:
+            return skipped
+        return await self._process_new_obra_async(session, obra_id)
+    
+    async def _process_new_obra_async(self, session: "aiohttp.ClientSession", obra_id: str) -> bool:
+        """
+        Versión asíncrona de _process_new_obra.
+        
+        Args:
+            session: Sesión de aiohttp del pipeline
+            obra_id: Identificador único de la obra
+            
+        Returns:
+            True si el proceso fue exitoso, False en caso contrario
+        """
+        await self._rate_limiter.wait_async()
+        try:
+            # Extraer información
+            html = await fetch_html_async(session, self.get_obra_url(obra_id))
+            obra_info = self.parse_obra_info(obra_id, html) if html else None
+            if not self._on_obra_found(obra_id, obra_info):
+                return False
             
             # Descargar imagen
-            if self.download_obra(obra_info):
+            return self._on_download_result(await self.download_obra_async(session, obra_info))
+        except Exception as e:
+            return self._on_error(obra_id, e)
+    
+    def _check_registry(self, obra_id: str) -> Optional[bool]:
+        """
+        Verifica en el registro si la obra ya fue procesada.
+        
+        Returns:
+            None si hay que procesar la obra; si no, el resultado registrado
+        """
+        if not self.registry:
+            return None
+        
+        # Obras que no existían en una ejecución anterior: se omiten sin tocar la red
+        if obra_id in self._known_missing:
+            self.logger.debug("Obra %s no encontrada anteriormente, omitiendo", obra_id)
+            return False
+        
+        # Verificar si ya fue procesada
+        if not self._is_processed(obra_id):
+            return None
+        
+        status = self.registry.get_status(obra_id)
+        self.logger.debug("Obra %s ya procesada (estado: %s), omitiendo", obra_id, status.label)
+        # Actualizar estadísticas según el estado registrado
+        with self._lock:
+            if status == ObraStatus.DOWNLOADED:
+                self.stats.obras_encontradas += 1
                 self.stats.obras_descargadas += 1
-                self.logger.info(f"  ✓ Imagen descargada exitosamente")
-                return True
-            else:
-                self.stats.obras_fallidas += 1
-                self.logger.warning(f"  ✗ Error al descargar imagen")
+            elif status == ObraStatus.FOUND:
+                self.stats.obras_encontradas += 1
+        return status == ObraStatus.DOWNLOADED
+    
+    def _is_processed(self, obra_id: str) -> bool:
+        """
+        Verifica si la obra ya fue procesada y, si corresponde, si su archivo sigue en disco.
+        
+        Returns:
+            True si no hace falta volver a procesar la obra
+        """
+        if not self.registry.is_processed(obra_id):
+            return False
+        
+        if self.check_existing_files:
+            file_path = self.registry.get_file_path(obra_id)
+            if file_path and not self._file_exists(file_path):
+                self.logger.debug("Obra %s registrada pero archivo no existe: %s", obra_id, file_path)
                 return False
-                
-        except Exception as e:
-            self.stats.obras_fallidas += 1
-            self.logger.error(f"Error procesando obra {obra_id}: {e}")
-            # Registrar error
+        return True
+    
+    def _on_obra_found(self, obra_id: str, obra_info: Optional[ObraInfo]) -> bool:
+        """
+        Registra el resultado de extraer la información de una obra.
+        
+        Returns:
+            True si la obra existe y hay que descargar su imagen
+        """
+        if not obra_info:
+            # Registrar como no encontrada
             if self.registry:
-                self.registry.register_obra(obra_id, 'fallido', error=str(e))
+                self.registry.register_obra(obra_id, ObraStatus.NOT_FOUND)
             return False
+        
+        with self._lock:
+            self.stats.obras_encontradas += 1
+        self.logger.info("Obra encontrada [%s]: %s - %s", obra_id, obra_info.titulo,
+                         obra_info.artista or 'Sin artista')
+        
+        # Registrar como encontrada (antes de intentar descargar)
+        if self.registry:
+            self.registry.register_obra(
+                obra_id,
+                ObraStatus.FOUND,
+                titulo=obra_info.titulo,
+                artista=obra_info.artista
+            )
+        return True
+    
+    def _on_download_result(self, success: bool) -> bool:
+        """Actualiza las estadísticas según el resultado de la descarga."""
+        with self._lock:
+            if success:
+                self.stats.obras_descargadas += 1
+            else:
+                self.stats.obras_fallidas += 1
+        if success:
+            self.logger.info("  ✓ Imagen descargada exitosamente")
+        else:
+            self.logger.warning("  ✗ Error al descargar imagen")
+        return success
+    
+    def _on_error(self, obra_id: str, error: Exception) -> bool:
+        """
+        Registra un error inesperado al procesar una obra.
+        
+        Nunca lanza excepciones: se llama desde el manejador de errores de
+        _process_new_obra y un fallo aquí abortaría todo el rango.
+        """
+        with self._lock:
+            self.stats.obras_fallidas += 1
+        self.logger.error("Error procesando obra %s: %s", obra_id, error)
+        # Registrar error
+        if self.registry:
+            try:
+                self.registry.register_obra(obra_id, ObraStatus.FAILED, error=str(error))
+            except Exception as e:
+                self.logger.error("No se pudo registrar el error de la obra %s: %s", obra_id, e)
+        return False
     
     def extract_range(self, start_id: int, end_id: int) -> ExtractionStats:
         """
         Extrae obras en un rango de IDs.
         
+        Si aiohttp está instalado y el extractor implementa parse_obra_info(),
+        delega en el pipeline asíncrono; si no, reparte las obras entre
+        `concurrency` hilos.
+        
         Args:
             start_id: ID inicial
             end_id: ID final
@@ -236,37 +548,116 @@ class BaseExtractor(ABC):
         Returns:
             Estadísticas de la extracción
         """
-        import time
+        if self.supports_async:
+            return asyncio.run(self.extract_range_async(start_id, end_id))
         
-        self.logger.info(f"Iniciando extracción desde ID {start_id} hasta {end_id}")
-        self.logger.info(f"Delay entre peticiones: {self.delay} segundos")
-        self.logger.info(f"Directorio de salida: {self.output_dir}")
+        self._log_start(start_id, end_id)
         
         # Reiniciar estadísticas
         self.stats = ExtractionStats()
+        obra_ids = self._pending_obra_ids(start_id, end_id)
         
-        for obra_id in range(start_id, end_id + 1):
-            obra_id_str = str(obra_id)
-            self.stats.total_procesado += 1
-            
-            self.process_obra(obra_id_str)
+        # El trabajo es casi todo espera de red, así que los hilos se solapan bien
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for _ in executor.map(self._process_new_obra, obra_ids):
+                pass
+        
+        if self.registry:
+            self.registry.flush()
+        self.print_summary()
+        return self.stats
+    
+    async def extract_range_async(self, start_id: int, end_id: int) -> ExtractionStats:
+        """
+        Extrae obras en un rango de IDs procesando varias en simultáneo.
+        
+        Como mucho hay `concurrency` obras en vuelo a la vez; todas comparten
+        una única sesión de aiohttp.
+        
+        Args:
+            start_id: ID inicial
+            end_id: ID final
             
-            # Aplicar delay entre peticiones (excepto en la última)
-            if obra_id < end_id:
-                time.sleep(self.delay)
+        Returns:
+            Estadísticas de la extracción
+        """
+        self._log_start(start_id, end_id)
+        self.logger.info("Obras en simultáneo: %d", self.concurrency)
+        
+        # Reiniciar estadísticas
+        self.stats = ExtractionStats()
+        obra_ids = self._pending_obra_ids(start_id, end_id)
+        sem = asyncio.Semaphore(self.concurrency)
+        
+        async def process(obra_id: str) -> bool:
+            async with sem:
+                return await self._process_new_obra_async(session, obra_id)
         
+        connector = aiohttp.TCPConnector(limit_per_host=self.concurrency)
+        headers = {'User-Agent': self.USER_AGENT} if self.USER_AGENT else None
+        if needs_recompression(self.image_format):
+            self._process_pool = ProcessPoolExecutor()
+        try:
+            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+                await asyncio.gather(*(process(obra_id) for obra_id in obra_ids))
+        finally:
+            if self._process_pool:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        
+        if self.registry:
+            self.registry.flush()
         self.print_summary()
         return self.stats
     
+    def _pending_obra_ids(self, start_id: int, end_id: int) -> List[str]:
+        """
+        Filtra de una sola pasada las obras del rango que hay que pedir.
+        
+        Las obras que el registro da por procesadas se contabilizan aquí y no
+        llegan a planificarse en los hilos o en el event loop.
+        
+        Args:
+            start_id: ID inicial
+            end_id: ID final
+            
+        Returns:
+            IDs de las obras pendientes, en orden
+        """
+        self._load_known_missing()
+        self.stats.total_procesado = end_id - start_id + 1
+        
+        obra_ids = [str(obra_id) for obra_id in range(start_id, end_id + 1)]
+        if not self.registry:
+            return obra_ids
+        
+        pending = [obra_id for obra_id in obra_ids if self._check_registry(obra_id) is None]
+        self.logger.info("Obras pendientes: %d de %d", len(pending), len(obra_ids))
+        return pending
+    
+    def _load_known_missing(self) -> None:
+        """Carga del registro los IDs marcados como no encontrados, si se pidió omitirlos."""
+        if self.registry and self.skip_not_found:
+            self._known_missing = self.registry.get_processed_ids(ObraStatus.NOT_FOUND)
+            self.logger.info("Obras no encontradas anteriormente (se omiten): %d", len(self._known_missing))
+        else:
+            self._known_missing = set()
+    
+    def _log_start(self, start_id: int, end_id: int) -> None:
+        """Muestra los parámetros de la extracción."""
+        self.logger.info("Iniciando extracción desde ID %d hasta %d", start_id, end_id)
+        self.logger.info("Delay mínimo entre peticiones: %s segundos", self.delay)
+        self.logger.info("Directorio de salida: %s", self.output_dir)
+    
     def print_summary(self):
         """Imprime un resumen de la extracción."""
         self.logger.info("=" * 60)
         self.logger.info("RESUMEN DE EXTRACCIÓN")
         self.logger.info("=" * 60)
-        self.logger.info(f"Obras encontradas: {self.stats.obras_encontradas}")
-        self.logger.info(f"Obras descargadas exitosamente: {self.stats.obras_descargadas}")
-        self.logger.info(f"Obras con errores: {self.stats.obras_fallidas}")
-        self.logger.info(f"Total procesado: {self.stats.total_procesado}")
+        self.logger.info("Obras encontradas: %d", self.stats.obras_encontradas)
+        self.logger.info("Obras descargadas exitosamente: %d", self.stats.obras_descargadas)
+        self.logger.info("Obras con errores: %d", self.stats.obras_fallidas)
+        self.logger.info("Total procesado: %d", self.stats.total_procesado)
         
         # Mostrar estadísticas del registro si está habilitado
         if self.registry:
@@ -3,14 +3,56 @@ Extractor para el Museo Nacional de Bellas Artes de Argentina.
 """
 
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+import html as html_lib
 import logging
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 
 from .base import BaseExtractor, ObraInfo
 from utils.network_utils import fetch_html
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 logger = logging.getLogger(__name__)
 
+# XPath precompiladas: se evalúan en C sobre un único árbol por página
+_TITULO_XPATH = etree.XPath("string((//h1)[1])")
+_DETALLES_XPATH = etree.XPath("(//dl[@class='row mt-3'])[1]//li")
+_IMAGEN_XPATH = etree.XPath("(//a[@data-fancybox='gallery'])[1]/@href")
+
+# Camino rápido: la página tiene un único <h1>, un único <dl class="row mt-3">
+# y un único enlace de galería, así que se pueden recortar con expresiones
+# regulares sin construir un árbol DOM. Cada elemento se ubica buscando su
+# apertura y después su cierre, para que el costo sea lineal aun con HTML mal
+# formado (p. ej. cientos de etiquetas sin cerrar)
+# Atributos de una etiqueta: un ">" entre comillas no la cierra. La cantidad de
+# caracteres/valores recorridos está acotada por la misma razón
+_ATTRS = r'''(?:[^>"']|"[^"]*"|'[^']*'){0,256}'''
+_ATTRS_LAZY = _ATTRS + '?'
+# Comentarios y elementos de texto crudo, que pueden contener etiquetas que
+# no forman parte del documento
+_RAW_TEXT_TAGS = ('script', 'style', 'textarea', 'title')
+_IGNORED_OPEN_RE = re.compile(r'<!--|<(' + '|'.join(_RAW_TEXT_TAGS) + r')\b' + _ATTRS + '>', re.I)
+_RAW_TEXT_CLOSE_RES = {tag: re.compile(r'</' + tag + r'\s*>', re.I) for tag in _RAW_TEXT_TAGS}
+_UNCLOSED_RE = re.compile(r'<!--|<(?:' + '|'.join(_RAW_TEXT_TAGS) + r')\b', re.I)
+_TITULO_OPEN_RE = re.compile(r'<h1(?:\s' + _ATTRS + r')?>', re.I)
+_TITULO_CLOSE_RE = re.compile(r'</h1\s*>', re.I)
+_TITULO_HINT_RE = re.compile(r'<h1[\s>]', re.I)
+_DETALLES_OPEN_RE = re.compile(r'<dl\s(?=' + _ATTRS_LAZY + r'(?<=\s)class="row mt-3")' + _ATTRS + '>', re.I)
+_DETALLES_CLOSE_RE = re.compile(r'</dl\s*>', re.I)
+_DETALLES_HINT = 'row mt-3'
+_LI_TAG_RE = re.compile(r'<(/?)li(?:\s' + _ATTRS + r')?>', re.I)
+_LI_OPEN_RE = re.compile(r'<li[\s>]', re.I)
+_IMAGEN_RE = re.compile(
+    r'<a\s(?=' + _ATTRS_LAZY + r'(?<=\s)data-fancybox=["\']gallery["\'])' + _ATTRS_LAZY
+    + r'(?<=\s)href=["\']([^"\']+)["\']', re.I
+)
+_IMAGEN_HINT_RE = re.compile(r'data-fancybox=["\']gallery["\']', re.I)
+_TAG_RE = re.compile(r'<' + _ATTRS + '>')
 
 class BellasArtesExtractor(BaseExtractor):
     """
@@ -21,9 +63,12 @@ class BellasArtesExtractor(BaseExtractor):
     
     BASE_URL = "https://www.bellasartes.gob.ar/coleccion/obra/"
     BASE_IMAGE_URL = "https://www.bellasartes.gob.ar/"
+    USER_AGENT = "ArtExtractor/1.0"
     
     def __init__(self, output_dir: str = "imagenes_obras_new", delay: float = 1.0,
-                 use_registry: bool = True, check_existing_files: bool = True):
+                 use_registry: bool = True, check_existing_files: bool = True,
+                 concurrency: int = 1, skip_not_found: bool = False,
+                 image_format: str = "jpg"):
         """
         Inicializa el extractor de Bellas Artes.
         
@@ -32,8 +77,12 @@ class BellasArtesExtractor(BaseExtractor):
             delay: Segundos de espera entre peticiones
             use_registry: Si es True, usa el sistema de registro
             check_existing_files: Si es True, verifica archivos existentes
+            concurrency: Número máximo de obras procesándose en simultáneo
+            skip_not_found: Si es True, omite las obras registradas como no encontradas
+            image_format: Formato de las imágenes guardadas ('jpg' o 'webp')
         """
-        super().__init__(output_dir, delay, use_registry, check_existing_files)
+        super().__init__(output_dir, delay, use_registry, check_existing_files, concurrency,
+                         skip_not_found, image_format)
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def get_obra_url(self, obra_id: str) -> str:
@@ -55,42 +104,37 @@ class BellasArtesExtractor(BaseExtractor):
             ObraInfo con la información de la obra, o None si no se encuentra
         """
         url = self.get_obra_url(obra_id)
-        html = fetch_html(url)
+        html = fetch_html(url, session=self.session)
         
         if not html:
             return None
         
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
+        return self.parse_obra_info(obra_id, html)
+    
+    def parse_obra_info(self, obra_id: str, html: str) -> Optional[ObraInfo]:
+        """
+        Extrae información de una obra a partir de su HTML.
+        
+        Args:
+            obra_id: ID de la obra
+            html: Contenido HTML de la página de la obra
             
-            # Extraer el título de la obra
-            titulo_tag = soup.find('h1')
-            titulo = titulo_tag.text.strip() if titulo_tag else None
+        Returns:
+            ObraInfo con la información de la obra, o None si no se encuentra
+        """
+        try:
+            titulo, detalles, img_url = self.extract_fields(html)
             
-            if not titulo:
+            if not titulo or not img_url:
                 return None
             
-            # Extraer información del artista
-            details_div = soup.find('dl', class_='row mt-3')
+            # El primer detalle es el artista; el resto son metadatos
             artista = None
             metadata = {}
-            
-            if details_div:
-                li_elements = details_div.find_all('li')
-                if li_elements:
-                    artista = li_elements[0].text.strip().replace(",", "")
-                    # Guardar otros metadatos si existen
-                    for i, li in enumerate(li_elements[1:], 1):
-                        metadata[f'detalle_{i}'] = li.text.strip()
-            
-            # Extraer URL de la imagen
-            img_tag = soup.find('a', {'data-fancybox': 'gallery'})
-            img_url = None
-            if img_tag and 'href' in img_tag.attrs:
-                img_url = img_tag['href']
-            
-            if not img_url:
-                return None
+            if detalles:
+                artista = detalles[0].replace(",", "")
+                for i, detalle in enumerate(detalles[1:], 1):
+                    metadata[f'detalle_{i}'] = detalle
             
             return ObraInfo(
                 titulo=titulo,
@@ -103,3 +147,216 @@ class BellasArtesExtractor(BaseExtractor):
         except Exception as e:
             self.logger.error(f"Error al parsear HTML de obra {obra_id}: {e}")
             return None
+    
+    @classmethod
+    def extract_fields(cls, html: str) -> Tuple[Optional[str], List[str], Optional[str]]:
+        """
+        Extrae título, detalles e imagen de la página de una obra, probando del
+        método más rápido al más tolerante.
+        
+        Args:
+            html: Contenido HTML de la página de la obra (ya decodificado)
+            
+        Returns:
+            Tupla (título, textos de los detalles, URL de la imagen)
+        """
+        fields = cls._extract_fields_regex(html)
+        if fields is not None:
+            # Un campo vacío es un resultado real (p. ej. una página sin <dl>)
+            return fields
+        
+        # Página con una forma irregular: usar un parser HTML completo. Lexbor
+        # sigue el algoritmo de HTML5 y no necesita otro intento
+        if LexborHTMLParser is not None:
+            return cls._extract_fields_selectolax(html)
+        
+        titulo, detalles, img_url = cls._extract_fields(html)
+        if not titulo or not img_url or not detalles:
+            # libxml2 reordena algunas anidaciones inválidas (p. ej. <li>
+            # directo dentro de <dl>): reintentar con el parser original
+            titulo, detalles, img_url = cls._extract_fields_bs4(html)
+        return titulo, detalles, img_url
+    
+    @staticmethod
+    def _extract_fields_regex(html: str) -> Optional[Tuple[Optional[str], List[str], Optional[str]]]:
+        """
+        Extrae título, detalles e imagen recortando el HTML con expresiones regulares.
+        
+        Solo cubre la forma habitual de la página: descarta comentarios y
+        scripts antes de buscar, y ante listas anidadas, elementos <li> sin
+        cerrar o comentarios sin cierre devuelve None para que se use un parser
+        HTML completo.
+        
+        Args:
+            html: Contenido HTML de la página de la obra
+            
+        Returns:
+            Tupla (título, textos de los detalles, URL de la imagen), o None si
+            la página tiene una forma que este método no puede verificar
+        """
+        html = _strip_ignored(html)
+        if html is None:
+            # Comentario o script sin cerrar: no se puede saber dónde termina
+            return None
+        
+        titulo = None
+        match = _TITULO_OPEN_RE.search(html)
+        if match:
+            close = _TITULO_CLOSE_RE.search(html, match.end())
+            if close is None:
+                return None
+            titulo = _fragment_text(html[match.end():close.start()])
+        elif _TITULO_HINT_RE.search(html):
+            # Hay un <h1> que la expresión no reconoce
+            return None
+        
+        detalles = []
+        match = _DETALLES_OPEN_RE.search(html)
+        if match:
+            close = _DETALLES_CLOSE_RE.search(html, match.end())
+            if close is None:
+                return None
+            detalles = _list_items(html[match.end():close.start()])
+            if detalles is None:
+                return None
+        elif _DETALLES_HINT in html:
+            return None
+        
+        img_url = None
+        # Buscar primero el atributo (barato) y solo entonces la etiqueta completa
+        if _IMAGEN_HINT_RE.search(html):
+            match = _IMAGEN_RE.search(html)
+            if match is None:
+                return None
+            img_url = html_lib.unescape(match.group(1))
+        
+        return titulo, detalles, img_url
+    
+    @staticmethod
+    def _extract_fields(html: str) -> Tuple[Optional[str], List[str], Optional[str]]:
+        """
+        Extrae título, detalles e imagen con lxml en una sola pasada de parseo.
+        
+        Args:
+            html: Contenido HTML de la página de la obra
+            
+        Returns:
+            Tupla (título, textos de los detalles, URL de la imagen)
+        """
+        tree = lxml_html.fromstring(html)
+        titulo = _TITULO_XPATH(tree).strip()
+        detalles = [li.text_content().strip() for li in _DETALLES_XPATH(tree)]
+        hrefs = _IMAGEN_XPATH(tree)
+        return titulo, detalles, str(hrefs[0]) if hrefs else None
+    
+    @staticmethod
+    def _extract_fields_selectolax(html: str) -> Tuple[Optional[str], List[str], Optional[str]]:
+        """
+        Equivalente de _extract_fields con selectolax (Lexbor), más rápido que lxml.
+        
+        Args:
+            html: Contenido HTML de la página de la obra
+            
+        Returns:
+            Tupla (título, textos de los detalles, URL de la imagen)
+        """
+        tree = LexborHTMLParser(html)
+        
+        titulo_node = tree.css_first('h1')
+        titulo = titulo_node.text().strip() if titulo_node else None
+        
+        details_node = tree.css_first('dl[class="row mt-3"]')
+        detalles = [li.text().strip() for li in details_node.css('li')] if details_node else []
+        
+        img_node = tree.css_first('a[data-fancybox="gallery"]')
+        img_url = img_node.attributes.get('href') if img_node else None
+        
+        return titulo, detalles, img_url
+    
+    @staticmethod
+    def _extract_fields_bs4(html: str) -> Tuple[Optional[str], List[str], Optional[str]]:
+        """
+        Equivalente de _extract_fields con BeautifulSoup, usado como respaldo.
+        
+        Args:
+            html: Contenido HTML de la página de la obra
+            
+        Returns:
+            Tupla (título, textos de los detalles, URL de la imagen)
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extraer el título de la obra
+        titulo_tag = soup.find('h1')
+        titulo = titulo_tag.text.strip() if titulo_tag else None
+        
+        # Extraer información del artista
+        details_div = soup.find('dl', class_='row mt-3')
+        detalles = [li.text.strip() for li in details_div.find_all('li')] if details_div else []
+        
+        # Extraer URL de la imagen
+        img_tag = soup.find('a', {'data-fancybox': 'gallery'})
+        img_url = None
+        if img_tag and 'href' in img_tag.attrs:
+            img_url = img_tag['href']
+        
+        return titulo, detalles, img_url
+
+
+def _strip_ignored(html: str) -> Optional[str]:
+    """
+    Quita del HTML los comentarios y los elementos de texto crudo (<script>, <style>, ...).
+    
+    Returns:
+        El HTML sin esos bloques, o None si alguno no tiene cierre
+    """
+    parts = []
+    pos = 0
+    while True:
+        match = _IGNORED_OPEN_RE.search(html, pos)
+        if match is None:
+            break
+        if match.group(1) is None:
+            end = html.find('-->', match.end())
+            end = end + 3 if end >= 0 else -1
+        else:
+            close = _RAW_TEXT_CLOSE_RES[match.group(1).lower()].search(html, match.end())
+            end = close.end() if close else -1
+        if end < 0:
+            return None
+        parts.append(html[pos:match.start()])
+        pos = end
+    parts.append(html[pos:])
+    stripped = ''.join(parts)
+    # Una apertura que la expresión no reconoció (p. ej. con atributos sin cerrar)
+    return None if _UNCLOSED_RE.search(stripped) else stripped
+
+
+def _list_items(fragment: str) -> Optional[List[str]]:
+    """
+    Textos de los <li> de un fragmento HTML.
+    
+    Returns:
+        Lista de textos, o None si algún <li> no está cerrado o contiene otro
+    """
+    items = []
+    start = None
+    for match in _LI_TAG_RE.finditer(fragment):
+        if match.group(1):
+            if start is None:
+                return None
+            items.append(_fragment_text(fragment[start:match.start()]))
+            start = None
+        elif start is not None:
+            return None
+        else:
+            start = match.end()
+    # Cada <li> abierto debe haberse reconocido y cerrado
+    if start is not None or len(items) != len(_LI_OPEN_RE.findall(fragment)):
+        return None
+    return items
+
+
+def _fragment_text(fragment: str) -> str:
+    """Texto de un fragmento HTML: sin etiquetas, con entidades resueltas y sin espacios extremos."""
+    return html_lib.unescape(_TAG_RE.sub('', fragment)).strip()
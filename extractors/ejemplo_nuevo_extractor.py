@@ -5,7 +5,7 @@ Este es un archivo de ejemplo que muestra cómo implementar un extractor
 para una nueva fuente de datos. Puedes copiarlo y adaptarlo según tus necesidades.
 """
 
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import logging
 from typing import Optional
 
@@ -14,6 +14,11 @@ from utils.network_utils import fetch_html
 
 logger = logging.getLogger(__name__)
 
+# XPath precompiladas una sola vez al importar el módulo (ajústalas a tu sitio)
+_TITULO_XPATH = etree.XPath("string((//h1)[1])")
+_ARTISTA_XPATH = etree.XPath("string((//span[@class='artist'])[1])")
+_IMAGEN_XPATH = etree.XPath("(//img[@class='obra-image'])[1]")
+
 
 class EjemploNuevoExtractor(BaseExtractor):
     """
@@ -22,23 +27,25 @@ class EjemploNuevoExtractor(BaseExtractor):
     Para usar este extractor:
     1. Renombra la clase con el nombre apropiado
     2. Actualiza BASE_URL y BASE_IMAGE_URL según tu fuente
-    3. Implementa extract_obra_info() según la estructura HTML de tu fuente
+    3. Implementa parse_obra_info() según la estructura HTML de tu fuente
     4. Registra el extractor en extractors/__init__.py
-    5. Agrega el origen en main.py en la función get_extractor()
+    5. Agrega sus alias en main.SOURCES y su descripción en main.SOURCE_DESCRIPTIONS
     """
     
     BASE_URL = "https://ejemplo.com/obras/"
     BASE_IMAGE_URL = "https://ejemplo.com/"
     
-    def __init__(self, output_dir: str = "imagenes_obras_new", delay: float = 1.0):
+    def __init__(self, output_dir: str = "imagenes_obras_new", delay: float = 1.0, **kwargs):
         """
         Inicializa el extractor.
         
         Args:
             output_dir: Directorio donde guardar las imágenes
             delay: Segundos de espera entre peticiones
+            **kwargs: Resto de las opciones de BaseExtractor, que get_extractor()
+                pasa a todos los extractores (use_registry, concurrency, etc.)
         """
-        super().__init__(output_dir, delay)
+        super().__init__(output_dir, delay, **kwargs)
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def get_obra_url(self, obra_id: str) -> str:
@@ -66,8 +73,7 @@ class EjemploNuevoExtractor(BaseExtractor):
         """
         Extrae información de una obra desde el sitio web.
         
-        Este método debe adaptarse según la estructura HTML del sitio web
-        que quieras extraer. Usa BeautifulSoup para parsear el HTML.
+        Descarga el HTML y delega el parseo en parse_obra_info().
         
         Args:
             obra_id: ID de la obra
@@ -76,41 +82,56 @@ class EjemploNuevoExtractor(BaseExtractor):
             ObraInfo con la información de la obra, o None si no se encuentra
         """
         url = self.get_obra_url(obra_id)
-        html = fetch_html(url)
+        html = fetch_html(url, session=self.session)
         
         if not html:
             return None
         
+        return self.parse_obra_info(obra_id, html)
+    
+    def parse_obra_info(self, obra_id: str, html: str) -> Optional[ObraInfo]:
+        """
+        Extrae información de una obra a partir de su HTML.
+        
+        Este método debe adaptarse según la estructura HTML del sitio web
+        que quieras extraer. Usa lxml y XPath para parsear el HTML.
+        Implementarlo habilita el modo asíncrono del extractor.
+        
+        Args:
+            obra_id: ID de la obra
+            html: Contenido HTML de la página de la obra
+            
+        Returns:
+            ObraInfo con la información de la obra, o None si no se encuentra
+        """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            tree = lxml_html.fromstring(html)
             
             # ADAPTA ESTA SECCIÓN SEGÚN LA ESTRUCTURA HTML DE TU SITIO WEB
             
             # Ejemplo: Extraer título
-            titulo_tag = soup.find('h1')  # Ajusta el selector según tu sitio
-            titulo = titulo_tag.text.strip() if titulo_tag else None
+            titulo = _TITULO_XPATH(tree).strip() or None
             
             if not titulo:
                 return None
             
             # Ejemplo: Extraer artista
             # Busca el elemento que contiene el nombre del artista
-            artista_tag = soup.find('span', class_='artist')  # Ajusta según tu sitio
-            artista = artista_tag.text.strip() if artista_tag else None
+            artista = _ARTISTA_XPATH(tree).strip() or None
             
             # Ejemplo: Extraer URL de imagen
-            img_tag = soup.find('img', class_='obra-image')  # Ajusta según tu sitio
+            img_tags = _IMAGEN_XPATH(tree)
             img_url = None
-            if img_tag:
-                img_url = img_tag.get('src') or img_tag.get('data-src')
+            if img_tags:
+                img_url = img_tags[0].get('src') or img_tags[0].get('data-src')
             
             if not img_url:
                 return None
             
             # Opcional: Extraer metadatos adicionales
             metadata = {}
-            # metadata['año'] = soup.find('span', class_='year').text if soup.find('span', class_='year') else None
-            # metadata['técnica'] = soup.find('span', class_='technique').text if soup.find('span', class_='technique') else None
+            # metadata['año'] = tree.xpath("string(//span[@class='year'])").strip() or None
+            # metadata['técnica'] = tree.xpath("string(//span[@class='technique'])").strip() or None
             
             return ObraInfo(
                 titulo=titulo,
@@ -8,15 +8,32 @@ import argparse
 import sys
 import logging
 import os
+from typing import Dict, List, Type
 
-from config import setup_logging, DEFAULT_START_ID, DEFAULT_END_ID, DEFAULT_DELAY, DEFAULT_OUTPUT_DIR
+from config import (setup_logging, DEFAULT_START_ID, DEFAULT_END_ID, DEFAULT_DELAY, DEFAULT_OUTPUT_DIR,
+                    DEFAULT_CONCURRENCY, DEFAULT_IMAGE_FORMAT)
 from extractors import BellasArtesExtractor, BaseExtractor
+from utils.image_utils import IMAGE_FORMATS
 
 logger = logging.getLogger(__name__)
 
+# Tabla de despacho: alias (en minúsculas) -> clase extractora
+SOURCES: Dict[str, Type[BaseExtractor]] = {
+    alias: BellasArtesExtractor
+    for alias in ('bellasartes', 'bellas-artes', 'museo-bellas-artes', 'mnba')
+}
+
+# Descripción de cada origen, por su nombre principal
+SOURCE_DESCRIPTIONS: Dict[str, str] = {
+    'bellasartes': 'Museo Nacional de Bellas Artes de Argentina (https://www.bellasartes.gob.ar/)',
+}
+
 
 def get_extractor(source: str, output_dir: str, delay: float, 
-                 use_registry: bool = True, check_existing_files: bool = True) -> BaseExtractor:
+                 use_registry: bool = True, check_existing_files: bool = True,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 skip_not_found: bool = False,
+                 image_format: str = DEFAULT_IMAGE_FORMAT) -> BaseExtractor:
     """
     Obtiene un extractor según el origen especificado.
     
@@ -26,36 +43,45 @@ def get_extractor(source: str, output_dir: str, delay: float,
         delay: Delay entre peticiones
         use_registry: Si es True, usa el sistema de registro
         check_existing_files: Si es True, verifica archivos existentes
+        concurrency: Número máximo de obras procesándose en simultáneo
+        skip_not_found: Si es True, omite las obras registradas como no encontradas
+        image_format: Formato de las imágenes guardadas
         
     Returns:
         Instancia del extractor correspondiente
         
     Raises:
-        ValueError: Si el origen no es válido
+        ValueError: Si el origen o el formato de imagen no son válidos
     """
-    source_lower = source.lower()
-    
-    if source_lower in ['bellasartes', 'bellas-artes', 'museo-bellas-artes', 'mnba']:
-        return BellasArtesExtractor(
-            output_dir=output_dir, 
-            delay=delay,
-            use_registry=use_registry,
-            check_existing_files=check_existing_files
-        )
-    else:
-        raise ValueError(f"Origen de datos no válido: {source}. Orígenes disponibles: bellasartes")
+    extractor_class = SOURCES.get(source.lower())
+    if extractor_class is None:
+        raise ValueError(f"Origen de datos no válido: {source}. "
+                         f"Orígenes disponibles: {', '.join(SOURCE_DESCRIPTIONS)}")
+    
+    return extractor_class(
+        output_dir=output_dir, 
+        delay=delay,
+        use_registry=use_registry,
+        check_existing_files=check_existing_files,
+        concurrency=concurrency,
+        skip_not_found=skip_not_found,
+        image_format=image_format
+    )
 
 
 def list_sources():
     """Lista los orígenes de datos disponibles."""
-    sources = {
-        'bellasartes': 'Museo Nacional de Bellas Artes de Argentina (https://www.bellasartes.gob.ar/)',
-    }
+    # Agrupar los alias por clase extractora
+    aliases: Dict[Type[BaseExtractor], List[str]] = {}
+    for alias, extractor_class in SOURCES.items():
+        aliases.setdefault(extractor_class, []).append(alias)
     
     print("\nOrígenes de datos disponibles:")
     print("=" * 60)
-    for key, description in sources.items():
-        print(f"  {key:20} - {description}")
+    for key, *others in aliases.values():
+        print(f"  {key:20} - {SOURCE_DESCRIPTIONS.get(key, '')}")
+        if others:
+            print(f"  {'':20}   Alias: {', '.join(others)}")
     print()
 
 
@@ -75,12 +101,21 @@ Ejemplos de uso:
   # Ajustar delay y directorio de salida
   python main.py --source bellasartes --start 0 --end 100 --delay 2 --output mi_carpeta
   
+  # Procesar hasta 8 obras en simultáneo
+  python main.py --source bellasartes --concurrency 8
+  
+  # Guardar las imágenes recomprimidas en WebP (requiere Pillow)
+  python main.py --source bellasartes --format webp
+  
   # Modo verbose
   python main.py --source bellasartes --verbose
   
   # Ver estadísticas del registro
   python main.py --show-registry --output imagenes_obras
   
+  # Reanudar sin volver a pedir las obras que no existían
+  python main.py --source bellasartes --skip-not-found
+  
   # Desactivar registro (procesar todo sin verificar duplicados)
   python main.py --source bellasartes --no-registry
   
@@ -118,6 +153,23 @@ Ejemplos de uso:
         help=f'Segundos de espera entre peticiones (por defecto: {DEFAULT_DELAY})'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        '--workers',
+        '-c',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Número máximo de obras procesándose en simultáneo (por defecto: {DEFAULT_CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--format',
+        '-f',
+        choices=sorted(IMAGE_FORMATS),
+        default=DEFAULT_IMAGE_FORMAT,
+        help=f'Formato de las imágenes guardadas; webp recomprime con Pillow (por defecto: {DEFAULT_IMAGE_FORMAT})'
+    )
+    
     parser.add_argument(
         '--output',
         '-o',
@@ -151,6 +203,12 @@ Ejemplos de uso:
         help='No verifica si los archivos ya existen antes de descargar'
     )
     
+    parser.add_argument(
+        '--skip-not-found',
+        action='store_true',
+        help='Omite sin pedirlas las obras que el registro marca como no encontradas'
+    )
+    
     parser.add_argument(
         '--show-registry',
         action='store_true',
@@ -180,6 +238,10 @@ Ejemplos de uso:
         logger.error("El delay debe ser mayor o igual a 0")
         sys.exit(1)
     
+    if args.concurrency < 1:
+        logger.error("La concurrencia debe ser mayor o igual a 1")
+        sys.exit(1)
+    
     # Mostrar registro si se solicita
     if args.show_registry:
         from utils.registry_utils import ExtractionRegistry
@@ -195,7 +257,10 @@ Ejemplos de uso:
             args.output, 
             args.delay,
             use_registry=not args.no_registry,
-            check_existing_files=not args.no_check_files
+            check_existing_files=not args.no_check_files,
+            concurrency=args.concurrency,
+            skip_not_found=args.skip_not_found,
+            image_format=args.format
         )
         logger.info(f"Usando extractor: {extractor.__class__.__name__}")
         logger.info(f"Origen: {args.source}")
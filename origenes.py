@@ -4,14 +4,20 @@ Script para extraer imágenes de obras de arte del Museo Nacional de Bellas Arte
 """
 
 import requests
-from bs4 import BeautifulSoup
 import os
-import time
 import logging
 import argparse
-import re
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urljoin
+
+from extractors.bellasartes import BellasArtesExtractor
+from utils.file_utils import get_save_path
+from utils.network_utils import (RateLimiter, aiohttp, create_session, download_image, download_image_async,
+                                 warm_up_session)
+from utils.registry_utils import ExtractionRegistry, ObraStatus
 
 # Configurar logging
 logging.basicConfig(
@@ -21,181 +27,424 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Identificación del cliente (la misma que usa BellasArtesExtractor)
+USER_AGENT = "ArtExtractor/1.0"
+
+# Rutas de imágenes que alguna obra está descargando en este momento: dos
+# obras con el mismo artista y título van al mismo archivo
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
 
-def sanitize_filename(filename):
+def parse_obra_page(html):
     """
-    Sanitiza un nombre de archivo eliminando caracteres inválidos.
+    Parsea la página de una obra y extrae su información, con el mismo parser
+    que BellasArtesExtractor.
     
     Args:
-        filename: Nombre de archivo a sanitizar
+        html: HTML de la página, ya decodificado según el charset de la respuesta
         
     Returns:
-        Nombre de archivo sanitizado
+        Tupla con (título, artista, url_imagen) o (None, None, None) si no se encuentra
     """
-    # Reemplazar caracteres inválidos por guiones bajos
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    # Eliminar espacios múltiples y reemplazar por uno solo
-    filename = re.sub(r'\s+', ' ', filename)
-    # Eliminar espacios al inicio y final
-    filename = filename.strip()
-    # Limitar longitud (máximo 200 caracteres para evitar problemas)
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename
-
-
-def extract_obra_info(soup):
+    try:
+        titulo, detalles, img_url = BellasArtesExtractor.extract_fields(html)
+    except Exception as e:
+        logger.error(f"Error al extraer información de la obra: {e}")
+        return None, None, None
+    # El primer detalle es el artista
+    artista = detalles[0].replace(",", "") if detalles else None
+    return titulo or None, artista or None, img_url
+
+
+# Resultados posibles de procesar una obra
+ENCONTRADA_DESCARGADA = 'descargada'
+ENCONTRADA_FALLIDA = 'fallida'
+NO_ENCONTRADA = 'no_encontrada'
+ERROR = 'error'
+
+# Estado con que se guarda cada resultado en el registro
+_ESTADOS_REGISTRO = {
+    ENCONTRADA_DESCARGADA: ObraStatus.DOWNLOADED,
+    ENCONTRADA_FALLIDA: ObraStatus.FAILED,
+    NO_ENCONTRADA: ObraStatus.NOT_FOUND,
+    ERROR: ObraStatus.FAILED,
+}
+
+# Respuestas que indican que la obra no existe; cualquier otro error (timeout,
+# 5xx, conexión cortada) se registra como fallido para reintentarlo
+_NOT_FOUND_STATUSES = (404, 410)
+
+
+def _obra_save_path(output_dir, titulo, artista):
+    """
+    Ruta donde guardar la imagen de una obra: <output_dir>/<artista>/<título>.jpg.
+    
+    get_save_path sanitiza los nombres y crea el directorio del artista una
+    sola vez por proceso, así que la descarga no necesita verificarlo.
     """
-    Extrae información de una obra desde el HTML parseado.
+    return get_save_path(output_dir, artista, titulo)
+
+
+def _claim_save_path(save_path):
+    """
+    Reserva la ruta de una imagen para descargarla.
+    
+    Returns:
+        True si la ruta quedó reservada (liberarla con _release_save_path);
+        False si otra obra la está descargando
+    """
+    with _in_flight_lock:
+        if save_path in _in_flight:
+            return False
+        _in_flight.add(save_path)
+        return True
+
+
+def _release_save_path(save_path):
+    """Libera la ruta reservada por _claim_save_path."""
+    with _in_flight_lock:
+        _in_flight.discard(save_path)
+
+
+def _register_result(registry, obra_id, resultado, titulo=None, artista=None, file_path=None, error=None,
+                     page=None):
+    """
+    Guarda el resultado de una obra en el registro, si se usa uno.
     
     Args:
-        soup: Objeto BeautifulSoup con el HTML parseado
-        
+        page: Datos de la página (url_imagen, etag, last_modified) para poder
+            pedirla de forma condicional en la próxima corrida
+    
     Returns:
-        Tupla con (título, artista, url_imagen) o (None, None, None) si no se encuentra
+        El mismo resultado, para poder devolverlo directamente
     """
-    try:
-        # Extraer el título de la obra
-        titulo_tag = soup.find('h1')
-        titulo = titulo_tag.text.strip() if titulo_tag else None
-        
-        # Extraer información del artista
-        details_div = soup.find('dl', class_='row mt-3')
-        artista = None
-        if details_div:
-            li_elements = details_div.find_all('li')
-            if li_elements:
-                artista = li_elements[0].text.strip().replace(",", "")
-        
-        # Extraer URL de la imagen
-        img_tag = soup.find('a', {'data-fancybox': 'gallery'})
-        img_url = None
-        if img_tag and 'href' in img_tag.attrs:
-            img_url = img_tag['href']
+    if registry:
+        registry.register_obra(str(obra_id), _ESTADOS_REGISTRO[resultado], titulo=titulo,
+                               artista=artista, file_path=file_path, error=error, **(page or {}))
+    return resultado
+
+
+def _download_result(obra_id, titulo, artista, img_filename, ok, registry=None, page=None):
+    """Registra el resultado de una descarga y lo traduce a un resultado de obra."""
+    if ok:
+        logger.info(f"  ✓ Imagen guardada: {img_filename}")
+        return _register_result(registry, obra_id, ENCONTRADA_DESCARGADA, titulo, artista,
+                                file_path=img_filename, page=page)
+    logger.warning(f"  ✗ Error al descargar imagen para obra {obra_id}")
+    return _register_result(registry, obra_id, ENCONTRADA_FALLIDA, titulo, artista,
+                            error="Error al descargar imagen", page=page)
+
+
+def _in_flight_result(obra_id, titulo, artista, img_filename, registry=None, page=None):
+    """Resultado de una obra cuya imagen ya está descargando otra obra con el mismo artista y título."""
+    logger.info(f"  = Imagen en descarga por otra obra: {img_filename}")
+    return _register_result(registry, obra_id, ENCONTRADA_DESCARGADA, titulo, artista,
+                            file_path=img_filename, page=page)
+
+
+def _conditional_headers(entry):
+    """
+    Cabeceras para pedir una página solo si cambió desde la corrida anterior.
+    
+    Args:
+        entry: Entrada del registro de la obra (o None)
         
-        return titulo, artista, img_url
-    except Exception as e:
-        logger.error(f"Error al extraer información de la obra: {e}")
-        return None, None, None
+    Returns:
+        Diccionario con If-None-Match / If-Modified-Since (vacío si no hay datos)
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def _page_data(img_url, etag, last_modified):
+    """Datos de una página que se guardan en el registro junto con el resultado."""
+    return {'url_imagen': img_url, 'etag': etag, 'last_modified': last_modified}
+
+
+def _cached_obra_info(entry):
+    """
+    Información de una obra cuya página respondió 304 Not Modified.
+    
+    Returns:
+        Tupla (título, artista, url_imagen, datos de la página) tomada del registro
+    """
+    page = _page_data(entry.get('url_imagen'), entry.get('etag'), entry.get('last_modified'))
+    return entry.get('titulo'), entry.get('artista'), entry.get('url_imagen'), page
+
+
+def _pending_ids(start_id, end_id, registry):
+    """
+    IDs del rango que hay que procesar.
+    
+    Se omiten sin hacer ninguna petición las obras que el registro da por
+    descargadas y cuyo archivo sigue en disco.
+    """
+    obra_ids = range(start_id, end_id + 1)
+    if not registry:
+        return list(obra_ids)
+    
+    pending = [obra_id for obra_id in obra_ids if not registry.is_processed_int(obra_id, check_file=True)]
+    logger.info(f"Obras pendientes: {len(pending)} de {len(obra_ids)}")
+    return pending
 
 
-def download_image(img_url, base_url_img, save_path):
+def _process_obra(obra_id, session, output_dir, base_url, base_url_img, registry=None):
     """
-    Descarga una imagen desde una URL.
+    Procesa una obra: descarga su página, extrae la información y guarda la imagen.
     
     Args:
-        img_url: URL relativa o absoluta de la imagen
-        base_url_img: URL base para construir URLs relativas
-        save_path: Ruta donde guardar la imagen
+        obra_id: ID de la obra
+        session: Sesión HTTP compartida
+        output_dir: Directorio donde guardar las imágenes
+        base_url: URL base de las páginas de obras
+        base_url_img: URL base para construir URLs relativas de imágenes
+        registry: Registro donde guardar el resultado (opcional)
         
     Returns:
-        True si la descarga fue exitosa, False en caso contrario
+        Tupla (obra_id, resultado) con uno de ENCONTRADA_DESCARGADA,
+        ENCONTRADA_FALLIDA, NO_ENCONTRADA o ERROR
     """
+    url = f"{base_url}{obra_id}/"
+    entry = registry.get_entry(str(obra_id)) if registry else None
+    
     try:
-        # Construir URL completa
-        if img_url.startswith('/'):
-            full_img_url = urljoin(base_url_img, img_url)
-        elif img_url.startswith('http'):
-            full_img_url = img_url
+        # Hacer petición HTTP (condicional si la página ya se vio antes)
+        response = session.get(url, headers=_conditional_headers(entry), timeout=30)
+        if response.status_code == 304:
+            # Página sin cambios: se reusan los datos registrados sin parsearla
+            logger.debug(f"Obra {obra_id}: página sin cambios")
+            titulo, artista, img_url, page = _cached_obra_info(entry)
         else:
-            full_img_url = urljoin(base_url_img, img_url)
+            response.raise_for_status()
+            
+            # Analizar el contenido HTML y extraer información de la obra
+            titulo, artista, img_url = parse_obra_page(response.text)
+            page = _page_data(img_url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
         
-        # Descargar la imagen
-        img_response = requests.get(full_img_url, timeout=30)
-        img_response.raise_for_status()
+        if not titulo or not artista or not img_url:
+            logger.debug(f"Obra {obra_id}: Información incompleta (título: {titulo}, artista: {artista}, img_url: {img_url})")
+            return obra_id, _register_result(registry, obra_id, NO_ENCONTRADA, page=page)
         
-        # Guardar la imagen
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        with open(save_path, 'wb') as f:
-            f.write(img_response.content)
+        logger.info(f"Obra encontrada [{obra_id}]: {titulo} - {artista}")
+        img_filename = _obra_save_path(output_dir, titulo, artista)
         
-        return True
+        if not _claim_save_path(img_filename):
+            return obra_id, _in_flight_result(obra_id, titulo, artista, img_filename, registry, page)
+        
+        # Descargar imagen
+        try:
+            ok = download_image(img_url, base_url_img, img_filename, session=session, ensure_dir=False)
+        finally:
+            _release_save_path(img_filename)
+        return obra_id, _download_result(obra_id, titulo, artista, img_filename, ok, registry, page)
+    
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code in _NOT_FOUND_STATUSES:
+            logger.debug(f"Obra {obra_id} no encontrada: {e}")
+            return obra_id, _register_result(registry, obra_id, NO_ENCONTRADA)
+        logger.warning(f"Error HTTP al pedir obra {obra_id}: {e}")
+        return obra_id, _register_result(registry, obra_id, ERROR, error=str(e))
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error al descargar imagen {img_url}: {e}")
-        return False
+        logger.warning(f"Error de conexión al pedir obra {obra_id}: {e}")
+        return obra_id, _register_result(registry, obra_id, ERROR, error=str(e))
     except Exception as e:
-        logger.error(f"Error inesperado al guardar imagen: {e}")
-        return False
+        logger.error(f"Error inesperado procesando obra {obra_id}: {e}")
+        return obra_id, _register_result(registry, obra_id, ERROR, error=str(e))
 
 
-def scrape_obras(start_id, end_id, delay, output_dir='imagenes_obras'):
+async def _process_obra_async(obra_id, session, semaphore, rate_limiter, output_dir, base_url, base_url_img,
+                              registry=None):
     """
-    Extrae imágenes de obras de arte del Museo Nacional de Bellas Artes.
+    Versión asíncrona de _process_obra sobre una sesión de aiohttp.
     
     Args:
-        start_id: ID inicial de obra a procesar
-        end_id: ID final de obra a procesar
-        delay: Segundos de espera entre peticiones
+        obra_id: ID de la obra
+        session: Sesión de aiohttp compartida
+        semaphore: Semáforo que limita las obras en curso
+        rate_limiter: Turnos de petición compartidos
         output_dir: Directorio donde guardar las imágenes
+        base_url: URL base de las páginas de obras
+        base_url_img: URL base para construir URLs relativas de imágenes
+        registry: Registro donde guardar el resultado (opcional)
+        
+    Returns:
+        Tupla (obra_id, resultado), igual que _process_obra
     """
-    base_url = "https://www.bellasartes.gob.ar/coleccion/obra/"
-    base_url_img = "https://www.bellasartes.gob.ar/"
-    
-    # Crear directorio de salida
-    os.makedirs(output_dir, exist_ok=True)
-    
-    obras_encontradas = 0
-    obras_descargadas = 0
-    obras_fallidas = 0
-    
-    logger.info(f"Iniciando extracción de obras desde ID {start_id} hasta {end_id}")
-    logger.info(f"Delay entre peticiones: {delay} segundos")
+    url = f"{base_url}{obra_id}/"
+    entry = registry.get_entry(str(obra_id)) if registry else None
     
-    for obra_id in range(start_id, end_id + 1):
-        url = f"{base_url}{obra_id}/"
-        
+    async with semaphore:
+        await rate_limiter.wait_async()
         try:
-            # Hacer petición HTTP
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            # Hacer petición HTTP (condicional si la página ya se vio antes)
+            async with session.get(url, headers=_conditional_headers(entry),
+                                   timeout=aiohttp.ClientTimeout(total=30)) as response:
+                response.raise_for_status()
+                not_modified = response.status == 304
+                html = None if not_modified else await response.text()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
             
-            # Analizar el contenido HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extraer información de la obra
-            titulo, artista, img_url = extract_obra_info(soup)
+            if not_modified:
+                # Página sin cambios: se reusan los datos registrados sin parsearla
+                logger.debug(f"Obra {obra_id}: página sin cambios")
+                titulo, artista, img_url, page = _cached_obra_info(entry)
+            else:
+                # Analizar el contenido HTML en un hilo para no bloquear el event loop
+                loop = asyncio.get_running_loop()
+                titulo, artista, img_url = await loop.run_in_executor(None, parse_obra_page, html)
+                page = _page_data(img_url, etag, last_modified)
             
             if not titulo or not artista or not img_url:
                 logger.debug(f"Obra {obra_id}: Información incompleta (título: {titulo}, artista: {artista}, img_url: {img_url})")
-                continue
+                return obra_id, _register_result(registry, obra_id, NO_ENCONTRADA, page=page)
             
-            obras_encontradas += 1
             logger.info(f"Obra encontrada [{obra_id}]: {titulo} - {artista}")
+            img_filename = _obra_save_path(output_dir, titulo, artista)
             
-            # Sanitizar nombres
-            artista_sanitizado = sanitize_filename(artista)
-            titulo_sanitizado = sanitize_filename(titulo)
-            
-            # Crear ruta de guardado
-            dir_path = os.path.join(output_dir, artista_sanitizado)
-            img_filename = os.path.join(dir_path, f"{titulo_sanitizado}.jpg")
+            if not _claim_save_path(img_filename):
+                return obra_id, _in_flight_result(obra_id, titulo, artista, img_filename, registry, page)
             
             # Descargar imagen
-            if download_image(img_url, base_url_img, img_filename):
-                obras_descargadas += 1
-                logger.info(f"  ✓ Imagen guardada: {img_filename}")
-            else:
-                obras_fallidas += 1
-                logger.warning(f"  ✗ Error al descargar imagen para obra {obra_id}")
+            try:
+                ok = await download_image_async(session, img_url, base_url_img, img_filename, ensure_dir=False)
+            finally:
+                _release_save_path(img_filename)
+            return obra_id, _download_result(obra_id, titulo, artista, img_filename, ok, registry, page)
         
-        except requests.exceptions.RequestException as e:
-            logger.debug(f"Obra {obra_id} no encontrada o error de conexión: {e}")
+        except aiohttp.ClientResponseError as e:
+            if e.status in _NOT_FOUND_STATUSES:
+                logger.debug(f"Obra {obra_id} no encontrada: {e}")
+                return obra_id, _register_result(registry, obra_id, NO_ENCONTRADA)
+            logger.warning(f"Error HTTP al pedir obra {obra_id}: {e}")
+            return obra_id, _register_result(registry, obra_id, ERROR, error=str(e))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Error de conexión al pedir obra {obra_id}: {e}")
+            return obra_id, _register_result(registry, obra_id, ERROR, error=str(e) or type(e).__name__)
         except Exception as e:
             logger.error(f"Error inesperado procesando obra {obra_id}: {e}")
-            obras_fallidas += 1
-        
-        # Aplicar delay entre peticiones (excepto en la última)
-        if obra_id < end_id:
-            time.sleep(delay)
+            return obra_id, _register_result(registry, obra_id, ERROR, error=str(e))
+
+
+def _log_summary(resultados, total):
+    """
+    Muestra el resumen de la extracción.
     
-    # Resumen final
+    Args:
+        resultados: Counter con la cantidad de obras por resultado
+        total: Cantidad de IDs procesados
+    """
     logger.info("=" * 60)
     logger.info("RESUMEN DE EXTRACCIÓN")
     logger.info("=" * 60)
-    logger.info(f"Obras encontradas: {obras_encontradas}")
-    logger.info(f"Obras descargadas exitosamente: {obras_descargadas}")
-    logger.info(f"Obras con errores: {obras_fallidas}")
-    logger.info(f"Total procesado: {end_id - start_id + 1}")
+    logger.info(f"Obras encontradas: {resultados[ENCONTRADA_DESCARGADA] + resultados[ENCONTRADA_FALLIDA]}")
+    logger.info(f"Obras descargadas exitosamente: {resultados[ENCONTRADA_DESCARGADA]}")
+    logger.info(f"Obras con errores: {resultados[ENCONTRADA_FALLIDA] + resultados[ERROR]}")
+    logger.info(f"Total procesado: {total}")
+
+
+def scrape_obras(start_id, end_id, delay, output_dir='imagenes_obras', workers=8, registry=None, burst=1):
+    """
+    Extrae imágenes de obras de arte del Museo Nacional de Bellas Artes.
+    
+    Args:
+        start_id: ID inicial de obra a procesar
+        end_id: ID final de obra a procesar
+        delay: Segundos mínimos entre el inicio de dos peticiones (se respeta
+            en conjunto aunque haya varios hilos)
+        output_dir: Directorio donde guardar las imágenes
+        workers: Número de obras procesándose en simultáneo
+        registry: Registro de obras procesadas (opcional): las ya descargadas
+            se omiten y cada resultado se guarda en él
+        burst: Peticiones que pueden salir juntas sin esperar el delay (el
+            ritmo promedio sigue siendo una cada `delay` segundos)
+    """
+    base_url = "https://www.bellasartes.gob.ar/coleccion/obra/"
+    base_url_img = "https://www.bellasartes.gob.ar/"
+    
+    # Crear directorio de salida
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Una sola sesión para todo el rango: evita un handshake TCP+TLS por
+    # petición y anuncia gzip/br/zstd para que las páginas viajen comprimidas
+    session = create_session(user_agent=USER_AGENT, pool_maxsize=max(8, workers))
+    rate_limiter = RateLimiter(delay, burst)
+    
+    # Resolver el host y hacer el handshake antes de repartir el trabajo; el
+    # pool de la sesión es seguro entre hilos, así que cada hilo reutiliza las
+    # conexiones abiertas en lugar de tener su propia sesión
+    rate_limiter.wait()
+    warm_up_session(session, base_url_img)
+    
+    logger.info(f"Iniciando extracción de obras desde ID {start_id} hasta {end_id}")
+    logger.info(f"Delay mínimo entre peticiones: {delay} segundos")
+    logger.info(f"Obras en paralelo: {workers}")
+    
+    def process(obra_id):
+        rate_limiter.wait()
+        return _process_obra(obra_id, session, output_dir, base_url, base_url_img, registry)
+    
+    # executor.map cancela las obras pendientes si se interrumpe la corrida
+    # (Ctrl+C), en lugar de esperar a que se procese todo el rango
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(process, _pending_ids(start_id, end_id, registry))
+        resultados = Counter(resultado for _, resultado in results)
+    
+    if registry:
+        registry.flush()
+    
+    # Resumen final
+    _log_summary(resultados, end_id - start_id + 1)
+
+
+async def scrape_obras_async(start_id, end_id, delay, output_dir='imagenes_obras', workers=8, registry=None,
+                             burst=1):
+    """
+    Versión asíncrona de scrape_obras: todas las peticiones comparten unas
+    pocas conexiones y no hace falta un hilo por obra en curso.
+    
+    Args:
+        start_id: ID inicial de obra a procesar
+        end_id: ID final de obra a procesar
+        delay: Segundos mínimos entre el inicio de dos peticiones
+        output_dir: Directorio donde guardar las imágenes
+        workers: Número de obras procesándose en simultáneo
+        registry: Registro de obras procesadas (opcional)
+        burst: Peticiones que pueden salir juntas sin esperar el delay
+    """
+    base_url = "https://www.bellasartes.gob.ar/coleccion/obra/"
+    base_url_img = "https://www.bellasartes.gob.ar/"
+    
+    # Crear directorio de salida
+    os.makedirs(output_dir, exist_ok=True)
+    
+    rate_limiter = RateLimiter(delay, burst)
+    semaphore = asyncio.Semaphore(workers)
+    
+    logger.info(f"Iniciando extracción asíncrona de obras desde ID {start_id} hasta {end_id}")
+    logger.info(f"Delay mínimo entre peticiones: {delay} segundos")
+    logger.info(f"Obras en paralelo: {workers}")
+    
+    connector = aiohttp.TCPConnector(limit_per_host=workers)
+    headers = {'User-Agent': USER_AGENT}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        results = await asyncio.gather(*(
+            _process_obra_async(obra_id, session, semaphore, rate_limiter,
+                                output_dir, base_url, base_url_img, registry)
+            for obra_id in _pending_ids(start_id, end_id, registry)
+        ))
+    
+    if registry:
+        registry.flush()
+    
+    # Resumen final
+    _log_summary(Counter(resultado for _, resultado in results), end_id - start_id + 1)
 
 
 def main():
@@ -209,6 +458,10 @@ Ejemplos de uso:
   python origenes.py --start 100 --end 200
   python origenes.py --start 0 --end 100 --delay 2
   python origenes.py --start 1870 --end 1880 --output mi_carpeta
+  python origenes.py --start 0 --end 500 --workers 16 --delay 0.2
+  python origenes.py --start 0 --end 500 --workers 16 --delay 0.2 --async
+  python origenes.py --start 0 --end 500 --workers 16 --delay 0.5 --burst 4
+  python origenes.py --no-registry      # Vuelve a pedir todo, aunque ya esté descargado
         """
     )
     
@@ -230,7 +483,30 @@ Ejemplos de uso:
         '--delay',
         type=float,
         default=1.0,
-        help='Segundos de espera entre peticiones (por defecto: 1.0)'
+        help='Segundos mínimos entre el inicio de dos peticiones (por defecto: 1.0)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=8,
+        help='Número de obras a procesar en simultáneo (por defecto: 8)'
+    )
+    
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=1,
+        help='Peticiones que pueden salir juntas sin esperar el delay; el promedio '
+             'sigue siendo una cada --delay segundos (por defecto: 1)'
+    )
+    
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Usa aiohttp y asyncio en lugar de hilos (requiere aiohttp)'
     )
     
     parser.add_argument(
@@ -240,6 +516,12 @@ Ejemplos de uso:
         help='Directorio donde guardar las imágenes (por defecto: imagenes_obras)'
     )
     
+    parser.add_argument(
+        '--no-registry',
+        action='store_true',
+        help='Desactiva el registro de obras procesadas (vuelve a pedir todo el rango)'
+    )
+    
     parser.add_argument(
         '--verbose',
         '-v',
@@ -266,9 +548,30 @@ Ejemplos de uso:
         logger.error("El delay debe ser mayor o igual a 0")
         return
     
+    if args.workers < 1:
+        logger.error("El número de workers debe ser mayor o igual a 1")
+        return
+    
+    if args.burst < 1:
+        logger.error("El burst debe ser mayor o igual a 1")
+        return
+    
+    if args.use_async and aiohttp is None:
+        logger.error("El modo --async requiere aiohttp (pip install aiohttp)")
+        return
+    
+    # Mismo archivo de registro que usan los extractores de main.py
+    registry = None
+    if not args.no_registry:
+        registry = ExtractionRegistry(os.path.join(args.output, ".extraction_registry.json"))
+    
     # Ejecutar scraping
     try:
-        scrape_obras(args.start, args.end, args.delay, args.output)
+        if args.use_async:
+            asyncio.run(scrape_obras_async(args.start, args.end, args.delay, args.output, args.workers,
+                                           registry, args.burst))
+        else:
+            scrape_obras(args.start, args.end, args.delay, args.output, args.workers, registry, args.burst)
     except KeyboardInterrupt:
         logger.info("\nProceso interrumpido por el usuario")
     except Exception as e:
@@ -4,8 +4,13 @@ Utilidades para manejo de archivos.
 
 import re
 import os
+from functools import lru_cache
 from typing import Optional
 
+# Caracteres no permitidos en nombres de archivo (Windows es el más restrictivo)
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -21,9 +26,9 @@ def sanitize_filename(filename: str) -> str:
         return "sin_nombre"
     
     # Reemplazar caracteres inválidos por guiones bajos
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _INVALID_CHARS_RE.sub('_', filename)
     # Eliminar espacios múltiples y reemplazar por uno solo
-    filename = re.sub(r'\s+', ' ', filename)
+    filename = _WHITESPACE_RE.sub(' ', filename)
     # Eliminar espacios al inicio y final
     filename = filename.strip()
     # Limitar longitud (máximo 200 caracteres para evitar problemas)
@@ -59,15 +64,31 @@ def get_save_path(base_dir: str, subdir: Optional[str], filename: str, extension
     Returns:
         Ruta completa del archivo
     """
-    if subdir:
-        dir_path = os.path.join(base_dir, sanitize_filename(subdir))
-    else:
-        dir_path = base_dir
-    
-    ensure_directory(dir_path)
+    dir_path = _ensure_save_dir(base_dir, subdir)
     
     sanitized_filename = sanitize_filename(filename)
     if not sanitized_filename.endswith(f'.{extension}'):
         sanitized_filename = f"{sanitized_filename}.{extension}"
     
     return os.path.join(dir_path, sanitized_filename)
+
+
+@lru_cache(maxsize=4096)
+def _ensure_save_dir(base_dir: str, subdir: Optional[str]) -> str:
+    """
+    Crea (una sola vez por proceso) el directorio de guardado de un artista.
+    
+    Args:
+        base_dir: Directorio base
+        subdir: Subdirectorio (opcional, puede ser None)
+        
+    Returns:
+        Ruta del directorio
+    """
+    if subdir:
+        dir_path = os.path.join(base_dir, sanitize_filename(subdir))
+    else:
+        dir_path = base_dir
+    
+    ensure_directory(dir_path)
+    return dir_path
@@ -0,0 +1,71 @@
+"""
+Utilidades para el procesamiento de imágenes descargadas.
+"""
+
+import logging
+import os
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Formatos de salida soportados: extensión -> formato de Pillow
+# (None significa guardar los bytes del servidor tal cual)
+IMAGE_FORMATS = {
+    'jpg': None,
+    'webp': 'WEBP',
+}
+
+
+def needs_recompression(image_format: str) -> bool:
+    """
+    Indica si un formato de salida requiere recomprimir la imagen descargada.
+
+    Args:
+        image_format: Extensión del formato de salida
+
+    Returns:
+        True si hay que recomprimir con Pillow
+    """
+    return IMAGE_FORMATS.get(image_format) is not None
+
+
+def recompress_image(src_path: str, dst_path: str, image_format: str = "webp", quality: int = 85) -> bool:
+    """
+    Recomprime una imagen descargada al formato indicado.
+
+    Escribe primero en un archivo temporal, de modo que dst_path solo aparece
+    completo, y elimina el original al terminar. Es una función de módulo para
+    poder ejecutarse en un ProcessPoolExecutor.
+
+    Args:
+        src_path: Ruta de la imagen tal como se descargó
+        dst_path: Ruta de la imagen recomprimida
+        image_format: Extensión del formato de salida (ver IMAGE_FORMATS)
+        quality: Calidad de compresión (0-100)
+
+    Returns:
+        True si la imagen se recomprimió correctamente, False en caso contrario
+    """
+    tmp_path = dst_path + '.part'
+    try:
+        with Image.open(src_path) as img:
+            # WebP solo admite RGB/RGBA (p. ej. hay JPEG en CMYK)
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+            img.save(tmp_path, format=IMAGE_FORMATS[image_format], quality=quality, method=4)
+        os.replace(tmp_path, dst_path)
+        os.remove(src_path)
+        logger.debug(f"Imagen recomprimida en: {dst_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error al recomprimir imagen {src_path}: {e}")
+        for path in (tmp_path, src_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return False
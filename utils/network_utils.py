@@ -2,15 +2,194 @@
 Utilidades para operaciones de red.
 """
 
+import asyncio
+import os
+import shutil
 import requests
 import logging
+import threading
+import time
+import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util import make_headers
 from urllib.parse import urljoin
 from typing import Optional
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
 logger = logging.getLogger(__name__)
 
+# Codificaciones que urllib3 sabe descomprimir con los paquetes instalados
+# (añade br y zstd si están brotli y backports.zstd); requests por su cuenta
+# solo anuncia gzip y deflate
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+
+def create_session(user_agent: Optional[str] = None, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Crea una sesión HTTP que reutiliza conexiones (keep-alive) entre peticiones.
+    
+    Args:
+        user_agent: Valor de la cabecera User-Agent (opcional)
+        pool_maxsize: Conexiones abiertas como máximo por host
+        
+    Returns:
+        Sesión de requests lista para usar
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    return session
+
+
+class RateLimiter:
+    """
+    Limita las peticiones a una cada `interval` segundos en promedio.
+    
+    Funciona como un token bucket de capacidad `burst` (algoritmo GCRA): con
+    burst=1 los inicios de las peticiones quedan separados al menos `interval`
+    segundos; con burst=N, después de un rato sin actividad pueden salir hasta
+    N peticiones juntas, pero el ritmo sostenido sigue siendo el mismo.
+    
+    Es seguro usarlo desde varios hilos: cada llamada a reserve() se queda con
+    el siguiente turno libre, sin dormir con el lock tomado.
+    """
+    
+    def __init__(self, interval: float, burst: int = 1):
+        """
+        Inicializa el limitador.
+        
+        Args:
+            interval: Segundos entre peticiones, en promedio
+            burst: Peticiones que pueden salir juntas sin esperar
+        """
+        self.interval = interval
+        self.burst = max(1, burst)
+        # Momento (time.monotonic) teórico de la próxima petición si se
+        # respetara el intervalo exacto
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Reserva el próximo turno para lanzar una petición.
+        
+        Returns:
+            Segundos a esperar antes de lanzar la petición
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        # Se puede adelantar el turno hasta (burst - 1) intervalos
+        return max(0.0, slot - (self.burst - 1) * self.interval - now)
+    
+    def wait(self) -> None:
+        """Bloquea el hilo actual hasta su turno."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def wait_async(self) -> None:
+        """Versión asíncrona de wait: suspende la tarea actual hasta su turno."""
+        await asyncio.sleep(self.reserve())
+
+
+def warm_up_session(session: requests.Session, url: str, timeout: int = 10) -> bool:
+    """
+    Abre de antemano una conexión de la sesión (DNS, TCP y TLS) y la deja en el
+    pool, para que la primera petición real no pague esa latencia.
+    
+    Args:
+        session: Sesión a precalentar
+        url: URL del host con el que se va a trabajar
+        timeout: Timeout en segundos
+        
+    Returns:
+        True si se pudo conectar, False en caso contrario
+    """
+    try:
+        session.head(url, timeout=timeout).close()
+        return True
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"No se pudo precalentar la conexión con {url}: {e}")
+        return False
+
+
+# Sesión compartida por defecto para no pagar un handshake TCP+TLS por petición
+_session = create_session()
+
+# Tamaño de los bloques en que se escriben las imágenes a disco mientras llegan
+CHUNK_SIZE = 64 * 1024
+
+# Buffer del archivo de salida: agrupa varios bloques en cada escritura a disco
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Por debajo de este tamaño no vale la pena reservar el espacio de antemano
+PREALLOCATE_MIN_SIZE = 64 * 1024
+
+
+def _partial_path(save_path: str) -> str:
+    """
+    Ruta temporal donde se escribe una imagen hasta completar la descarga.
+    
+    Es única por descarga (en el mismo directorio, para que os.replace sea
+    atómico): dos descargas a la misma ruta nunca comparten el archivo parcial
+    ni se borran el uno al otro.
+    """
+    return f"{save_path}.{uuid.uuid4().hex[:12]}.part"
+
+
+def _preallocate(f, headers) -> None:
+    """
+    Reserva de una vez el espacio de una imagen en disco según su Content-Length,
+    para que el sistema de archivos no la vaya extendiendo (y fragmentando)
+    bloque a bloque mientras llega.
+    
+    Args:
+        f: Archivo recién abierto para escritura
+        headers: Cabeceras de la respuesta HTTP
+    """
+    # Con Content-Encoding el largo es el del cuerpo comprimido, no el del archivo
+    if not hasattr(os, 'posix_fallocate') or headers.get('Content-Encoding', 'identity') != 'identity':
+        return
+    try:
+        size = int(headers.get('Content-Length', 0))
+    except ValueError:
+        return
+    if size >= PREALLOCATE_MIN_SIZE:
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            # Algunos sistemas de archivos (p. ej. montajes de red) no lo soportan
+            pass
+
+
+def _discard_partial(partial_path: Optional[str]) -> None:
+    """Elimina el archivo parcial de una descarga, si llegó a crearse."""
+    if not partial_path:
+        return
+    try:
+        os.remove(partial_path)
+    except OSError:
+        pass
+
 
-def download_image(img_url: str, base_url: Optional[str] = None, save_path: str = None, timeout: int = 30) -> bool:
+def download_image(img_url: str, base_url: Optional[str] = None, save_path: str = None, timeout: int = 30,
+                   session: Optional[requests.Session] = None, ensure_dir: bool = True) -> bool:
     """
     Descarga una imagen desde una URL.
     
@@ -19,54 +198,63 @@ def download_image(img_url: str, base_url: Optional[str] = None, save_path: str
         base_url: URL base para construir URLs relativas (opcional)
         save_path: Ruta donde guardar la imagen
         timeout: Timeout en segundos para la petición
+        session: Sesión HTTP a usar (por defecto, la compartida del módulo)
+        ensure_dir: Si es False, se asume que el directorio de save_path ya
+            existe (p. ej. creado por get_save_path) y no se verifica
         
     Returns:
         True si la descarga fue exitosa, False en caso contrario
     """
+    partial_path = None
     try:
-        # Construir URL completa
-        if img_url.startswith('http://') or img_url.startswith('https://'):
-            full_img_url = img_url
-        elif base_url:
-            full_img_url = urljoin(base_url, img_url)
-        else:
-            logger.error(f"No se puede construir URL completa: base_url no proporcionada para {img_url}")
-            return False
+        # Construir URL completa (urljoin deja intactas las URLs absolutas)
+        full_img_url = urljoin(base_url, img_url) if base_url else img_url
         
         # Descargar la imagen
-        img_response = requests.get(full_img_url, timeout=timeout)
-        img_response.raise_for_status()
-        
-        # Guardar la imagen si se proporciona save_path
-        if save_path:
-            import os
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, 'wb') as f:
-                f.write(img_response.content)
-            logger.debug(f"Imagen guardada en: {save_path}")
+        with (session or _session).get(full_img_url, timeout=timeout, stream=True) as img_response:
+            img_response.raise_for_status()
+            
+            # Guardar la imagen si se proporciona save_path, escribiendo cada
+            # bloque a medida que llega; el archivo final solo aparece completo
+            if save_path:
+                if ensure_dir:
+                    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                # Copiar directo del socket al archivo, descomprimiendo si el
+                # servidor usó Content-Encoding
+                img_response.raw.decode_content = True
+                partial_path = _partial_path(save_path)
+                with open(partial_path, 'xb', buffering=WRITE_BUFFER_SIZE) as f:
+                    _preallocate(f, img_response.headers)
+                    shutil.copyfileobj(img_response.raw, f, CHUNK_SIZE)
+                os.replace(partial_path, save_path)
+                logger.debug(f"Imagen guardada en: {save_path}")
         
         return True
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
+        # Leer de response.raw expone los errores de urllib3 sin envolver
         logger.error(f"Error al descargar imagen {img_url}: {e}")
+        _discard_partial(partial_path)
         return False
     except Exception as e:
         logger.error(f"Error inesperado al guardar imagen: {e}")
+        _discard_partial(partial_path)
         return False
 
 
-def fetch_html(url: str, timeout: int = 30) -> Optional[str]:
+def fetch_html(url: str, timeout: int = 30, session: Optional[requests.Session] = None) -> Optional[str]:
     """
     Obtiene el contenido HTML de una URL.
     
     Args:
         url: URL a obtener
         timeout: Timeout en segundos
+        session: Sesión HTTP a usar (por defecto, la compartida del módulo)
         
     Returns:
         Contenido HTML como string, o None si hay error
     """
     try:
-        response = requests.get(url, timeout=timeout)
+        response = (session or _session).get(url, timeout=timeout)
         response.raise_for_status()
         return response.text
     except requests.exceptions.RequestException as e:
@@ -75,3 +263,84 @@ def fetch_html(url: str, timeout: int = 30) -> Optional[str]:
     except Exception as e:
         logger.error(f"Error inesperado al obtener HTML: {e}")
         return None
+
+
+async def download_image_async(session: "aiohttp.ClientSession", img_url: str,
+                               base_url: Optional[str] = None, save_path: str = None,
+                               timeout: int = 30, ensure_dir: bool = True) -> bool:
+    """
+    Versión asíncrona de download_image sobre una sesión de aiohttp.
+    
+    Args:
+        session: Sesión de aiohttp compartida por todo el pipeline
+        img_url: URL relativa o absoluta de la imagen
+        base_url: URL base para construir URLs relativas (opcional)
+        save_path: Ruta donde guardar la imagen
+        timeout: Timeout en segundos para la petición
+        ensure_dir: Si es False, se asume que el directorio de save_path ya existe
+        
+    Returns:
+        True si la descarga fue exitosa, False en caso contrario
+    """
+    partial_path = None
+    try:
+        # Construir URL completa (urljoin deja intactas las URLs absolutas)
+        full_img_url = urljoin(base_url, img_url) if base_url else img_url
+        
+        # Descargar la imagen
+        async with session.get(full_img_url, timeout=aiohttp.ClientTimeout(total=timeout)) as img_response:
+            img_response.raise_for_status()
+            
+            # Guardar la imagen si se proporciona save_path, escribiendo cada
+            # bloque a medida que llega; el archivo final solo aparece completo
+            if save_path:
+                if ensure_dir:
+                    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                chunks = img_response.content.iter_chunked(CHUNK_SIZE)
+                partial_path = _partial_path(save_path)
+                if aiofiles is not None:
+                    async with aiofiles.open(partial_path, 'xb') as f:
+                        _preallocate(f, img_response.headers)
+                        async for chunk in chunks:
+                            await f.write(chunk)
+                else:
+                    with open(partial_path, 'xb', buffering=WRITE_BUFFER_SIZE) as f:
+                        _preallocate(f, img_response.headers)
+                        async for chunk in chunks:
+                            f.write(chunk)
+                os.replace(partial_path, save_path)
+                logger.debug(f"Imagen guardada en: {save_path}")
+        
+        return True
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error al descargar imagen {img_url}: {e}")
+        _discard_partial(partial_path)
+        return False
+    except Exception as e:
+        logger.error(f"Error inesperado al guardar imagen: {e}")
+        _discard_partial(partial_path)
+        return False
+
+
+async def fetch_html_async(session: "aiohttp.ClientSession", url: str, timeout: int = 30) -> Optional[str]:
+    """
+    Versión asíncrona de fetch_html sobre una sesión de aiohttp.
+    
+    Args:
+        session: Sesión de aiohttp compartida por todo el pipeline
+        url: URL a obtener
+        timeout: Timeout en segundos
+        
+    Returns:
+        Contenido HTML como string, o None si hay error
+    """
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            response.raise_for_status()
+            return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug(f"Error al obtener HTML de {url}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error inesperado al obtener HTML: {e}")
+        return None
@@ -2,21 +2,101 @@
 Utilidades para el registro de obras procesadas.
 """
 
+import atexit
 import json
 import os
 import logging
-from typing import Dict, Optional, Set
+import threading
+from collections import Counter
+from enum import IntEnum
+from typing import Dict, Optional, Set, Union
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+class ObraStatus(IntEnum):
+    """
+    Estado de una obra en el registro.
+    
+    Se guarda en el JSON como entero; los registros antiguos, que usaban los
+    nombres en español ('descargado', 'fallido', ...), se convierten al cargarlos.
+    """
+    
+    NOT_FOUND = 0
+    FOUND = 1
+    DOWNLOADED = 2
+    FAILED = 3
+    
+    @property
+    def label(self) -> str:
+        """Nombre en español del estado (el usado por los registros antiguos)."""
+        return _STATUS_LABELS[self]
+    
+    @classmethod
+    def parse(cls, value: Union[int, str]) -> 'ObraStatus':
+        """
+        Convierte un estado leído del registro (entero o nombre antiguo) en ObraStatus.
+        
+        Raises:
+            ValueError: Si el valor no corresponde a ningún estado
+        """
+        if isinstance(value, str):
+            try:
+                return _STATUS_BY_LABEL[value]
+            except KeyError:
+                raise ValueError(f"Estado desconocido: {value}") from None
+        return cls(value)
+
+
+_STATUS_LABELS = {
+    ObraStatus.NOT_FOUND: 'no_encontrado',
+    ObraStatus.FOUND: 'encontrado',
+    ObraStatus.DOWNLOADED: 'descargado',
+    ObraStatus.FAILED: 'fallido',
+}
+_STATUS_BY_LABEL = {label: status for status, label in _STATUS_LABELS.items()}
+
+
+# Campos de cada entrada además del estado, en el orden en que se serializan
+_FIELDS = ('timestamp', 'titulo', 'artista', 'file_path', 'error')
+
+# Datos de la página para pedirla de forma condicional en otra corrida; solo
+# se serializan si tienen valor
+_PAGE_FIELDS = ('url_imagen', 'etag', 'last_modified')
+
+
+def _loads(data: bytes):
+    """Decodifica JSON con orjson si está disponible (bastante más rápido que json)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class ExtractionRegistry:
     """
     Registro de obras procesadas para evitar duplicados y permitir reanudar extracciones.
+    
+    El registro completo (snapshot) se reescribe cada FLUSH_EVERY registros,
+    al llamar a flush() y al terminar el proceso. Entre snapshots, cada
+    registro se agrega como una línea a un log JSONL junto al archivo, que se
+    reaplica al cargar: si el proceso muere no se pierde nada de lo registrado.
+    
+    En memoria los datos se guardan por columnas (un dict por campo, indexado
+    por ID) en lugar de un dict por obra: la mayoría de los campos son None y
+    no ocupan lugar. En disco se mantiene el formato de siempre, un objeto
+    JSON {obra_id: {status, timestamp, titulo, ...}}.
     """
     
+    # Cantidad de registros acumulados antes de reescribir el archivo
+    FLUSH_EVERY = 50
+    
     def __init__(self, registry_file: str = ".extraction_registry.json"):
         """
         Inicializa el registro.
@@ -25,52 +105,180 @@ class ExtractionRegistry:
             registry_file: Ruta al archivo de registro (JSON)
         """
         self.registry_file = registry_file
-        self.registry: Dict[str, Dict] = {}
+        # Log de escritura anticipada: registros posteriores al último snapshot
+        self.log_file = os.path.splitext(registry_file)[0] + '.jsonl'
+        # Estado de cada obra registrada (define qué IDs hay en el registro)
+        self._status: Dict[str, ObraStatus] = {}
+        # Un dict por campo; solo contienen los valores distintos de None
+        self._columns: Dict[str, Dict[str, str]] = {field: {} for field in _FIELDS + _PAGE_FIELDS}
+        # IDs numéricos de las obras encontradas o descargadas, para consultar
+        # is_processed sin convertir cada ID a string
+        self._processed_ids: Set[int] = set()
+        self._dirty_count = 0
+        self._log = None
+        # Permite registrar obras desde varios hilos a la vez
+        self._lock = threading.RLock()
         self._load_registry()
+        self._replay_log()
+        atexit.register(self.flush)
     
     def _load_registry(self) -> None:
         """Carga el registro desde el archivo."""
         if os.path.exists(self.registry_file):
             try:
-                with open(self.registry_file, 'r', encoding='utf-8') as f:
-                    self.registry = json.load(f)
-                logger.debug(f"Registro cargado: {len(self.registry)} obras registradas")
+                with open(self.registry_file, 'rb') as f:
+                    data = _loads(f.read())
+                for obra_id, entry in data.items():
+                    self._set_entry(obra_id, entry)
+                logger.debug(f"Registro cargado: {len(self._status)} obras registradas")
             except Exception as e:
                 logger.warning(f"Error al cargar registro: {e}. Iniciando registro vacío.")
-                self.registry = {}
-        else:
-            self.registry = {}
+                self._reset()
+    
+    def _reset(self) -> None:
+        """Vacía el registro en memoria."""
+        self._status = {}
+        self._columns = {field: {} for field in _FIELDS + _PAGE_FIELDS}
+        self._processed_ids = set()
+    
+    def _set_entry(self, obra_id: str, entry: Dict) -> None:
+        """Guarda una entrada (con el formato del archivo) en las columnas."""
+        status = ObraStatus.parse(entry['status'])
+        self._status[obra_id] = status
+        if obra_id.isdigit():
+            if status in (ObraStatus.DOWNLOADED, ObraStatus.FOUND):
+                self._processed_ids.add(int(obra_id))
+            else:
+                self._processed_ids.discard(int(obra_id))
+        for field, column in self._columns.items():
+            value = entry.get(field)
+            if value is None:
+                column.pop(obra_id, None)
+            else:
+                column[obra_id] = value
+    
+    def _get_entry(self, obra_id: str) -> Dict:
+        """Reconstruye la entrada de una obra con el formato del archivo."""
+        entry = {'status': self._status[obra_id]}
+        for field in _FIELDS:
+            entry[field] = self._columns[field].get(obra_id)
+        for field in _PAGE_FIELDS:
+            value = self._columns[field].get(obra_id)
+            if value is not None:
+                entry[field] = value
+        return entry
+    
+    def to_dict(self) -> Dict[str, Dict]:
+        """
+        Obtiene el registro completo con el formato del archivo.
+        
+        Returns:
+            Diccionario {obra_id: entrada}
+        """
+        return {obra_id: self._get_entry(obra_id) for obra_id in self._status}
+    
+    def _replay_log(self) -> None:
+        """Aplica sobre el snapshot los registros del log que quedaron sin consolidar."""
+        if not os.path.exists(self.log_file):
+            return
+        
+        replayed = 0
+        with open(self.log_file, 'rb') as f:
+            for line in f:
+                try:
+                    obra_id, entry = _loads(line)
+                    self._set_entry(obra_id, entry)
+                except Exception:
+                    # Línea a medio escribir si el proceso murió durante un append
+                    logger.warning(f"Línea inválida en {self.log_file}, se ignora")
+                    continue
+                replayed += 1
+        
+        logger.debug(f"Log reaplicado: {replayed} registros")
+        # Consolidar ya mismo: deja un snapshot completo y el log vacío (sin
+        # una posible última línea cortada a la que se agregarían otras)
+        self._save_registry()
+    
+    def _append_log(self, obra_id: str, entry: Dict) -> None:
+        """Agrega un registro al log (se llama con el lock tomado)."""
+        try:
+            if self._log is None:
+                log_dir = os.path.dirname(self.log_file)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                self._log = open(self.log_file, 'ab')
+            if orjson is not None:
+                line = orjson.dumps([obra_id, entry])
+            else:
+                line = json.dumps([obra_id, entry], ensure_ascii=False).encode('utf-8')
+            self._log.write(line + b'\n')
+            self._log.flush()
+        except Exception as e:
+            logger.error(f"Error al escribir log del registro: {e}")
     
     def _save_registry(self) -> None:
         """Guarda el registro en el archivo."""
+        with self._lock:
+            self._write_registry()
+    
+    def _write_registry(self) -> None:
+        """Escribe el registro completo en el archivo."""
         try:
             # Asegurar que el directorio existe
             registry_dir = os.path.dirname(self.registry_file)
             if registry_dir and not os.path.exists(registry_dir):
                 os.makedirs(registry_dir, exist_ok=True)
             
-            with open(self.registry_file, 'w', encoding='utf-8') as f:
-                json.dump(self.registry, f, indent=2, ensure_ascii=False)
+            # Escribir a un temporal y reemplazar: el snapshot nunca queda a medias
+            tmp_file = self.registry_file + '.tmp'
+            if orjson is not None:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+            else:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.registry_file)
+            self._dirty_count = 0
+            self._truncate_log()
         except Exception as e:
             logger.error(f"Error al guardar registro: {e}")
     
-    def register_obra(self, obra_id: str, status: str, 
+    def _truncate_log(self) -> None:
+        """Vacía el log: todo lo registrado ya está en el snapshot."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+    
+    def flush(self) -> None:
+        """Guarda en disco los cambios pendientes, si los hay."""
+        if self._dirty_count:
+            self._save_registry()
+    
+    def register_obra(self, obra_id: str, status: ObraStatus, 
                      titulo: Optional[str] = None,
                      artista: Optional[str] = None,
                      file_path: Optional[str] = None,
-                     error: Optional[str] = None) -> None:
+                     error: Optional[str] = None,
+                     url_imagen: Optional[str] = None,
+                     etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> None:
         """
         Registra una obra procesada.
         
         Args:
             obra_id: ID de la obra
-            status: Estado ('encontrado', 'descargado', 'fallido', 'no_encontrado')
+            status: Estado de la obra
             titulo: Título de la obra (opcional)
             artista: Artista de la obra (opcional)
             file_path: Ruta del archivo descargado (opcional)
             error: Mensaje de error si hubo (opcional)
+            url_imagen: URL de la imagen según la página (opcional)
+            etag: Cabecera ETag de la página (opcional)
+            last_modified: Cabecera Last-Modified de la página (opcional)
         """
-        self.registry[obra_id] = {
+        entry = {
             'status': status,
             'timestamp': datetime.now().isoformat(),
             'titulo': titulo,
@@ -78,7 +286,15 @@ class ExtractionRegistry:
             'file_path': file_path,
             'error': error
         }
-        self._save_registry()
+        for field, value in (('url_imagen', url_imagen), ('etag', etag), ('last_modified', last_modified)):
+            if value is not None:
+                entry[field] = value
+        with self._lock:
+            self._set_entry(obra_id, entry)
+            self._append_log(obra_id, entry)
+            self._dirty_count += 1
+            if self._dirty_count >= self.FLUSH_EVERY:
+                self._save_registry()
     
     def is_processed(self, obra_id: str, check_file: bool = False) -> bool:
         """
@@ -91,21 +307,38 @@ class ExtractionRegistry:
         Returns:
             True si la obra ya fue procesada (y el archivo existe si check_file=True)
         """
-        if obra_id not in self.registry:
+        status = self._status.get(obra_id)
+        if status is None:
             return False
         
-        entry = self.registry[obra_id]
-        
         # Si check_file=True, verificar que el archivo exista
-        if check_file and entry.get('file_path'):
-            if not os.path.exists(entry['file_path']):
-                logger.debug(f"Obra {obra_id} registrada pero archivo no existe: {entry['file_path']}")
+        file_path = self._columns['file_path'].get(obra_id)
+        if check_file and file_path:
+            if not os.path.exists(file_path):
+                logger.debug(f"Obra {obra_id} registrada pero archivo no existe: {file_path}")
                 return False
         
         # Considerar procesada si está descargada o encontrada
-        return entry.get('status') in ('descargado', 'encontrado')
+        return status in (ObraStatus.DOWNLOADED, ObraStatus.FOUND)
     
-    def get_status(self, obra_id: str) -> Optional[str]:
+    def is_processed_int(self, obra_id: int, check_file: bool = False) -> bool:
+        """
+        Equivalente de is_processed para IDs numéricos, pensado para recorrer
+        rangos grandes: la mayoría de las consultas se resuelven en un set de
+        enteros sin armar el string del ID.
+        
+        Args:
+            obra_id: ID numérico de la obra
+            check_file: Si es True, también verifica que el archivo exista
+            
+        Returns:
+            True si la obra ya fue procesada (y el archivo existe si check_file=True)
+        """
+        if obra_id not in self._processed_ids:
+            return False
+        return not check_file or self.is_processed(str(obra_id), check_file=True)
+    
+    def get_status(self, obra_id: str) -> Optional[ObraStatus]:
         """
         Obtiene el estado de una obra.
         
@@ -115,11 +348,35 @@ class ExtractionRegistry:
         Returns:
             Estado de la obra o None si no está registrada
         """
-        if obra_id in self.registry:
-            return self.registry[obra_id].get('status')
-        return None
+        return self._status.get(obra_id)
+    
+    def get_entry(self, obra_id: str) -> Optional[Dict]:
+        """
+        Obtiene la entrada completa de una obra.
+        
+        Args:
+            obra_id: ID de la obra
+            
+        Returns:
+            Diccionario con el estado y los datos registrados, o None si no está registrada
+        """
+        if obra_id not in self._status:
+            return None
+        return self._get_entry(obra_id)
     
-    def get_processed_ids(self, status: Optional[str] = None) -> Set[str]:
+    def get_file_path(self, obra_id: str) -> Optional[str]:
+        """
+        Obtiene la ruta del archivo descargado de una obra.
+        
+        Args:
+            obra_id: ID de la obra
+            
+        Returns:
+            Ruta del archivo o None si no está registrada o no tiene archivo
+        """
+        return self._columns['file_path'].get(obra_id)
+    
+    def get_processed_ids(self, status: Optional[ObraStatus] = None) -> Set[str]:
         """
         Obtiene el conjunto de IDs procesados.
         
@@ -129,31 +386,21 @@ class ExtractionRegistry:
         Returns:
             Conjunto de IDs procesados
         """
-        if status:
-            return {obra_id for obra_id, entry in self.registry.items() 
-                   if entry.get('status') == status}
-        return set(self.registry.keys())
+        if status is not None:
+            return {obra_id for obra_id, obra_status in self._status.items()
+                    if obra_status == status}
+        return set(self._status)
     
     def get_stats(self) -> Dict[str, int]:
         """
         Obtiene estadísticas del registro.
         
         Returns:
-            Diccionario con conteos por estado
-        """
-        stats = {
-            'total': len(self.registry),
-            'descargado': 0,
-            'encontrado': 0,
-            'fallido': 0,
-            'no_encontrado': 0
-        }
-        
-        for entry in self.registry.values():
-            status = entry.get('status', 'unknown')
-            if status in stats:
-                stats[status] += 1
-        
+            Diccionario con conteos por estado (claves: 'total' y el nombre de cada estado)
+        """
+        counts = Counter(self._status.values())
+        stats = {'total': len(self._status)}
+        stats.update((status.label, counts[status]) for status in ObraStatus)
         return stats
     
     def print_stats(self) -> None:
@@ -170,8 +417,9 @@ class ExtractionRegistry:
     
     def clear(self) -> None:
         """Limpia el registro."""
-        self.registry = {}
-        self._save_registry()
+        with self._lock:
+            self._reset()
+            self._save_registry()
         logger.info("Registro limpiado")
     
     def remove_entry(self, obra_id: str) -> None:
@@ -181,7 +429,13 @@ class ExtractionRegistry:
         Args:
             obra_id: ID de la obra a eliminar
         """
-        if obra_id in self.registry:
-            del self.registry[obra_id]
+        with self._lock:
+            if obra_id not in self._status:
+                return
+            del self._status[obra_id]
+            if obra_id.isdigit():
+                self._processed_ids.discard(int(obra_id))
+            for column in self._columns.values():
+                column.pop(obra_id, None)
             self._save_registry()
             logger.debug(f"Entrada {obra_id} eliminada del registro")